@@ -1,12 +1,19 @@
 from __future__ import annotations
 
-from typing import Dict, Optional
+from bisect import bisect_right
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Iterable, Iterator, Optional
 
+import orjson
 import psycopg2
 from psycopg2 import sql
-from fastapi import APIRouter, HTTPException, status
-from pydantic import BaseModel, Field
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, ConfigDict, ValidationError, field_validator
 
+from app.models.pg_catalog import PgColumn, PgSchema, PgTable
 from app.services import postgres_service, postgres_session
 
 router = APIRouter(prefix="/api/pg", tags=["postgres"])
@@ -16,13 +23,28 @@ router = APIRouter(prefix="/api/pg", tags=["postgres"])
 # Pydantic models (match frontend types.ts)
 # -------------------------
 
+_SSL_MODES = frozenset({"require", "prefer", "disable"})
+
+# For models that only describe responses in the OpenAPI schema: the routes
+# return pre-encoded bodies and never instantiate them, so skip compiling
+# their own validator/serializer at import.
+_RESPONSE_ONLY = ConfigDict(defer_build=True)
+
+
 class PostgresCredentials(BaseModel):
     host: str
     port: int = 5432
     database: str
     username: str
     password: str
-    sslMode: str = Field(default="disable", pattern="^(require|prefer|disable)$")
+    sslMode: str = "disable"
+
+    @field_validator("sslMode")
+    @classmethod
+    def _check_ssl_mode(cls, v: str) -> str:
+        if v not in _SSL_MODES:
+            raise ValueError("sslMode must be one of: require, prefer, disable")
+        return v
 
 
 class PostgresColumn(BaseModel):
@@ -33,6 +55,8 @@ class PostgresColumn(BaseModel):
 
 
 class PostgresTable(BaseModel):
+    model_config = _RESPONSE_ONLY
+
     name: str
     columns: list[PostgresColumn]
     primaryKey: Optional[str] = None
@@ -40,11 +64,15 @@ class PostgresTable(BaseModel):
 
 
 class PostgresSchema(BaseModel):
+    model_config = _RESPONSE_ONLY
+
     name: str
     tables: list[PostgresTable]
 
 
 class PostgresConnectionResponse(BaseModel):
+    model_config = _RESPONSE_ONLY
+
     success: bool
     schemas: Optional[list[PostgresSchema]] = None
     error: Optional[str] = None
@@ -58,6 +86,8 @@ class SurveyCTOField(BaseModel):
 
 
 class SchemaCompatibility(BaseModel):
+    model_config = _RESPONSE_ONLY
+
     compatible: bool
     missingColumns: list[str]
     extraColumns: list[str]
@@ -86,7 +116,7 @@ class CreateTableResponse(BaseModel):
 # Helpers
 # -------------------------
 
-_ALLOWED_TYPES = {
+_ALLOWED_TYPES = frozenset({
     "TEXT",
     "INTEGER",
     "BIGINT",
@@ -97,140 +127,388 @@ _ALLOWED_TYPES = {
     "TIMESTAMP",
     "TIMESTAMPTZ",
     "JSONB",
+})
+
+# Long-form spellings accepted by create_table, mapped to the allowed names.
+_TYPE_ALIASES: dict[str, str] = {
+    "TIMESTAMP WITH TIME ZONE": "TIMESTAMPTZ",
+    "TIMESTAMP WITHOUT TIME ZONE": "TIMESTAMP",
+}
+
+_UDT_TO_PG_TYPE: dict[str, str] = {
+    "text": "TEXT",
+    "varchar": "TEXT",
+    "bpchar": "TEXT",
+    "int2": "INTEGER",
+    "int4": "INTEGER",
+    "int8": "BIGINT",
+    "float4": "DOUBLE PRECISION",
+    "float8": "DOUBLE PRECISION",
+    "numeric": "NUMERIC",
+    "bool": "BOOLEAN",
+    "date": "DATE",
+    "timestamp": "TIMESTAMP",
+    "timestamptz": "TIMESTAMPTZ",
+    "json": "JSONB",
+    "jsonb": "JSONB",
 }
 
 
 def _coerce_allowed_type(t: str) -> str:
     normalized = t.strip().upper()
-    if normalized == "TIMESTAMP WITH TIME ZONE":
-        normalized = "TIMESTAMPTZ"
-    if normalized == "TIMESTAMP WITHOUT TIME ZONE":
-        normalized = "TIMESTAMP"
-    if normalized not in _ALLOWED_TYPES:
-        return "TEXT"
-    return normalized
-
-
-def _normalize_pg_type(udt_name: str) -> str:
-    mapping = {
-        "text": "TEXT",
-        "varchar": "TEXT",
-        "bpchar": "TEXT",
-        "int2": "INTEGER",
-        "int4": "INTEGER",
-        "int8": "BIGINT",
-        "float4": "DOUBLE PRECISION",
-        "float8": "DOUBLE PRECISION",
-        "numeric": "NUMERIC",
-        "bool": "BOOLEAN",
-        "date": "DATE",
-        "timestamp": "TIMESTAMP",
-        "timestamptz": "TIMESTAMPTZ",
-        "json": "JSONB",
-        "jsonb": "JSONB",
+    normalized = _TYPE_ALIASES.get(normalized, normalized)
+    return normalized if normalized in _ALLOWED_TYPES else "TEXT"
+
+
+# Same mapping as a SQL expression over pg_type ``t``, so reflection queries
+# return normalized type names and rows need no per-column lookup. Domains
+# map through their base type ``bt``, as information_schema's udt_name does.
+_PG_TYPE_SQL = (
+    "CASE lower(COALESCE(bt.typname, t.typname)) "
+    + " ".join(f"WHEN '{udt}' THEN '{pg_type}'" for udt, pg_type in _UDT_TO_PG_TYPE.items())
+    + " ELSE 'TEXT' END"
+)
+
+
+def _json_body(model: type[BaseModel]):
+    """Dependency that validates the raw request body straight into ``model``.
+
+    pydantic-core parses and validates JSON in one pass, skipping the
+    json.loads -> dict -> model round-trip FastAPI does for body params.
+    Worth it for the payloads carrying long column/field lists.
+    """
+
+    async def _parse(request: Request) -> BaseModel:
+        raw = await request.body()
+        try:
+            return model.model_validate_json(raw)
+        except ValidationError as exc:
+            # Same 422 shape as FastAPI's own body params: locs start at "body".
+            raise RequestValidationError(
+                [{**e, "loc": ("body", *e["loc"])} for e in exc.errors(include_url=False)]
+            ) from exc
+
+    return _parse
+
+
+def _json_body_openapi(model: type[BaseModel]) -> dict:
+    """openapi_extra for routes using _json_body(): a Depends carries no
+    requestBody, so the model's schema is declared by hand.
+
+    Nested models are inlined, since "#/$defs/..." refs would resolve
+    against the OpenAPI document root rather than this schema.
+    """
+    schema = model.model_json_schema()
+    defs = schema.pop("$defs", {})
+
+    def inline(node):
+        if isinstance(node, dict):
+            ref = node.get("$ref")
+            if isinstance(ref, str) and ref.startswith("#/$defs/"):
+                return inline(defs[ref[len("#/$defs/"):]])
+            return {k: inline(v) for k, v in node.items()}
+        if isinstance(node, list):
+            return [inline(v) for v in node]
+        return node
+
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": inline(schema)}},
+        }
     }
-    return mapping.get((udt_name or "").lower(), "TEXT")
 
 
-def _ensure_connected() -> None:
+def require_pg_credentials() -> postgres_service.PgCredentials:
+    """Route dependency: 400 unless POST /api/pg/connect has stored credentials."""
     try:
-        postgres_service.get_credentials()
+        return postgres_service.get_credentials()
     except RuntimeError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
 
-def _connect():
-    _ensure_connected()
+_REQUIRES_CONNECTION = [Depends(require_pg_credentials)]
+
+
+@contextmanager
+def _connection() -> Iterator[psycopg2.extensions.connection]:
+    """Borrow a pooled connection for the duration of the block."""
     try:
-        return postgres_service.connect()
+        conn = postgres_service.connect()
     except psycopg2.Error as exc:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)) from exc
+    try:
+        yield conn
+    finally:
+        postgres_service.release(conn)
 
 
-def _fetch_schemas(conn) -> list[str]:
-    with conn.cursor() as cur:
-        cur.execute(
-            """
-            SELECT schema_name
-            FROM information_schema.schemata
-            WHERE schema_name NOT IN ('pg_catalog', 'information_schema')
-            ORDER BY schema_name
-            """
-        )
-        return [r[0] for r in cur.fetchall()]
-
-
-def _fetch_tables(conn, schema: str) -> list[str]:
-    with conn.cursor() as cur:
-        cur.execute(
-            """
-            SELECT table_name
-            FROM information_schema.tables
-            WHERE table_schema = %s
-              AND table_type = 'BASE TABLE'
-            ORDER BY table_name
-            """,
-            (schema,),
-        )
-        return [r[0] for r in cur.fetchall()]
-
+def _fetch_table(conn, schema: str, table: str) -> Optional[PgTable]:
+    """Reflect one base table (columns + primary key) in a single query.
 
-def _fetch_columns(conn, schema: str, table: str) -> list[PostgresColumn]:
+    Returns None if ``schema.table`` is not a base table, so callers need no
+    separate existence check. The LEFT JOIN keeps a zero-column table as a
+    single row with a NULL column name.
+    """
     with conn.cursor() as cur:
         cur.execute(
-            """
+            f"""
             SELECT
-                c.column_name,
-                c.udt_name,
-                (c.is_nullable = 'YES') AS is_nullable
-            FROM information_schema.columns c
-            WHERE c.table_schema = %s
-              AND c.table_name = %s
-            ORDER BY c.ordinal_position
+                a.attname,
+                {_PG_TYPE_SQL} AS pg_type,
+                NOT a.attnotnull AS is_nullable,
+                COALESCE(a.attnum = ANY(i.indkey), false) AS is_pk
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            LEFT JOIN pg_attribute a
+              ON a.attrelid = c.oid
+             AND a.attnum > 0
+             AND NOT a.attisdropped
+             AND (
+                    pg_has_role(c.relowner, 'USAGE')
+                 OR has_column_privilege(c.oid, a.attnum, 'SELECT, INSERT, UPDATE, REFERENCES')
+             )
+            LEFT JOIN pg_type t ON t.oid = a.atttypid
+            LEFT JOIN pg_type bt ON t.typtype = 'd' AND bt.oid = t.typbasetype
+            LEFT JOIN pg_index i
+              ON i.indrelid = c.oid
+             AND i.indisprimary
+            WHERE n.nspname = %s
+              AND c.relname = %s
+              AND c.relkind IN ('r', 'p')
+            ORDER BY a.attnum
             """,
             (schema, table),
         )
-        cols = cur.fetchall()
-
+        found = False
+        columns: list[PgColumn] = []
+        pk: Optional[str] = None
+        for name, pg_type, is_nullable, is_pk in cur:
+            found = True
+            if name is None:
+                continue
+            if is_pk and pk is None:
+                pk = name
+            columns.append(PgColumn(name, pg_type, is_nullable, is_pk))
+    if not found:
+        return None
+    return PgTable(name=table, columns=tuple(columns), primaryKey=pk)
+
+
+def _fetch_catalog(conn, schema: Optional[str] = None) -> list[PgSchema]:
+    """Reflect schemas -> tables -> columns (with PK flags) in one round-trip.
+
+    Reads pg_catalog directly: the information_schema views are built from
+    the same tables but add several layers of joins and per-row privilege
+    checks, which dominates on large catalogs. The visibility rules of
+    information_schema.schemata / .tables / .columns and its domain -> base
+    type resolution are reproduced explicitly.
+
+    Schemas without tables and tables without columns are kept, hence the
+    LEFT JOINs. Pass ``schema`` to restrict reflection to a single schema.
+    """
+    with conn.cursor() as cur:
         cur.execute(
-            """
-            SELECT kcu.column_name
-            FROM information_schema.table_constraints tc
-            JOIN information_schema.key_column_usage kcu
-              ON tc.constraint_name = kcu.constraint_name
-             AND tc.table_schema = kcu.table_schema
-            WHERE tc.constraint_type = 'PRIMARY KEY'
-              AND tc.table_schema = %s
-              AND tc.table_name = %s
+            f"""
+            SELECT
+                n.nspname,
+                c.relname,
+                a.attname,
+                {_PG_TYPE_SQL} AS pg_type,
+                NOT a.attnotnull AS is_nullable,
+                COALESCE(a.attnum = ANY(i.indkey), false) AS is_pk
+            FROM pg_namespace n
+            LEFT JOIN pg_class c
+              ON c.relnamespace = n.oid
+             AND c.relkind IN ('r', 'p')
+             AND (
+                    pg_has_role(c.relowner, 'USAGE')
+                 OR has_table_privilege(c.oid, 'SELECT, INSERT, UPDATE, DELETE, TRUNCATE, REFERENCES, TRIGGER')
+                 OR has_any_column_privilege(c.oid, 'SELECT, INSERT, UPDATE, REFERENCES')
+             )
+            LEFT JOIN pg_attribute a
+              ON a.attrelid = c.oid
+             AND a.attnum > 0
+             AND NOT a.attisdropped
+             AND (
+                    pg_has_role(c.relowner, 'USAGE')
+                 OR has_column_privilege(c.oid, a.attnum, 'SELECT, INSERT, UPDATE, REFERENCES')
+             )
+            LEFT JOIN pg_type t
+              ON t.oid = a.atttypid
+            LEFT JOIN pg_type bt
+              ON t.typtype = 'd'
+             AND bt.oid = t.typbasetype
+            LEFT JOIN pg_index i
+              ON i.indrelid = c.oid
+             AND i.indisprimary
+            WHERE n.nspname NOT IN ('pg_catalog', 'information_schema')
+              AND (pg_has_role(n.nspowner, 'USAGE') OR has_schema_privilege(n.oid, 'CREATE, USAGE'))
+              AND (%s::text IS NULL OR n.nspname = %s::text)
+            ORDER BY n.nspname, c.relname, a.attnum
             """,
-            (schema, table),
+            (schema, schema),
         )
-        pk_cols = {r[0] for r in cur.fetchall()}
+        # Group straight off the cursor rather than materializing the whole
+        # result as a list of row tuples first.
+        grouped: dict[str, dict[str, list[PgColumn]]] = {}
+        pks: dict[tuple[str, str], str] = {}
+        for schema_name, table_name, column_name, pg_type, is_nullable, is_pk in cur:
+            tables = grouped.setdefault(schema_name, {})
+            if table_name is None:
+                continue
+            columns = tables.setdefault(table_name, [])
+            if column_name is None:
+                continue
+            columns.append(PgColumn(column_name, pg_type, is_nullable, is_pk))
+            if is_pk:
+                pks.setdefault((schema_name, table_name), column_name)
 
     return [
-        PostgresColumn(
-            name=name,
-            type=_normalize_pg_type(udt_name),
-            nullable=bool(is_nullable),
-            isPrimaryKey=name in pk_cols,
+        PgSchema(
+            name=schema_name,
+            tables=tuple(
+                PgTable(name=table_name, columns=tuple(columns), primaryKey=pks.get((schema_name, table_name)))
+                for table_name, columns in tables.items()
+            ),
         )
-        for (name, udt_name, is_nullable) in cols
+        for schema_name, tables in grouped.items()
     ]
 
 
+_SURVEYCTO_TO_PG_TYPE: dict[str, str] = {
+    "integer": "INTEGER",
+    "int": "INTEGER",
+    "decimal": "NUMERIC",
+    "double": "NUMERIC",
+    "float": "NUMERIC",
+    "numeric": "NUMERIC",
+    "date": "DATE",
+    "datetime": "TIMESTAMPTZ",
+    "timestamp": "TIMESTAMPTZ",
+    "boolean": "BOOLEAN",
+    "bool": "BOOLEAN",
+}
+
+
+@lru_cache(maxsize=64)
 def _map_surveycto_type_to_pg(field_type: str) -> str:
-    t = (field_type or "").strip().lower()
-    if t in {"integer", "int"}:
-        return "INTEGER"
-    if t in {"decimal", "double", "float", "numeric"}:
-        return "NUMERIC"
-    if t in {"date"}:
-        return "DATE"
-    if t in {"datetime", "timestamp"}:
-        return "TIMESTAMPTZ"
-    if t in {"boolean", "bool"}:
-        return "BOOLEAN"
-    return "TEXT"
+    if not field_type:
+        return "TEXT"
+    return _SURVEYCTO_TO_PG_TYPE.get(field_type.strip().lower(), "TEXT")
+
+
+@lru_cache(maxsize=256)
+def _expected_if_mismatch(field_type: str, actual: str) -> Optional[str]:
+    """Expected PG type for a SurveyCTO field type, or None if ``actual`` is compatible."""
+    expected = _map_surveycto_type_to_pg(field_type)
+    if expected == actual or (expected == "NUMERIC" and actual in {"INTEGER", "BIGINT", "NUMERIC"}):
+        return None
+    return expected
+
+
+def _diff_schemas(
+    form_fields: list[SurveyCTOField],
+    col_types: dict[str, str],
+) -> tuple[Optional[str], list[str], list[str], list[dict]]:
+    """Compare form fields with a table's column types in one pass.
+
+    Returns (form_pk, missing, extra, type_mismatches); missing keeps form
+    order and extra keeps catalog order. The type check is memoized on
+    (field type, column type), so each field costs a few hash lookups.
+    """
+    form_names: set[str] = set()
+    form_pk: Optional[str] = None
+    missing: list[str] = []
+    type_mismatches: list[dict] = []
+    for f in form_fields:
+        name = f.name
+        if f.isPrimaryKey and form_pk is None:
+            form_pk = name
+        actual = col_types.get(name)
+        if name not in form_names:
+            form_names.add(name)
+            if actual is None:
+                missing.append(name)
+        if actual is None:
+            continue
+        expected = _expected_if_mismatch(f.type, actual)
+        if expected is not None:
+            type_mismatches.append({"field": name, "expected": expected, "actual": actual})
+
+    extra = [name for name in col_types if name not in form_names]
+    return form_pk, missing, extra, type_mismatches
+
+
+@lru_cache(maxsize=256)
+def _build_create_table_sql(
+    schema: str,
+    table: str,
+    columns: tuple[tuple[str, str, bool], ...],
+    pk: Optional[str],
+) -> sql.Composed:
+    """CREATE SCHEMA + CREATE TABLE for ``(name, type, nullable)`` columns.
+
+    Memoized on the full table signature, so retries and repeated creates of
+    the same table skip re-composing the identifiers.
+    """
+    col_defs: list[sql.Composable] = [
+        sql.SQL("{} {} {}").format(
+            sql.Identifier(name),
+            sql.SQL(col_type),
+            sql.SQL("NULL" if nullable else "NOT NULL"),
+        )
+        for name, col_type, nullable in columns
+    ]
+    if pk:
+        col_defs.append(sql.SQL("PRIMARY KEY ({})").format(sql.Identifier(pk)))
+
+    # Both statements go out in one round-trip; in autocommit mode a
+    # multi-statement query runs as a single implicit transaction.
+    return sql.SQL("CREATE SCHEMA IF NOT EXISTS {}; CREATE TABLE IF NOT EXISTS {}.{} ({})").format(
+        sql.Identifier(schema),
+        sql.Identifier(schema),
+        sql.Identifier(table),
+        sql.SQL(", ").join(col_defs),
+    )
+
+
+def _iter_json_array(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    yield b"["
+    for i, chunk in enumerate(chunks):
+        if i:
+            yield b","
+        yield chunk
+    yield b"]"
+
+
+def _connect_error(message: str) -> ORJSONResponse:
+    return ORJSONResponse({"success": False, "schemas": None, "error": message})
+
+
+def _compatibility_response(
+    *,
+    compatible: bool,
+    missing: list[str],
+    extra: list[str],
+    type_mismatches: list[dict],
+    pk_match: bool,
+) -> ORJSONResponse:
+    """SchemaCompatibility body, encoded directly.
+
+    Returning a Response skips FastAPI's response_model pass, which would
+    otherwise dump, re-validate and re-dump every list built above; the
+    response_model stays on the route for the OpenAPI schema.
+    """
+    return ORJSONResponse(
+        {
+            "compatible": compatible,
+            "missingColumns": missing,
+            "extraColumns": extra,
+            "typeMismatches": type_mismatches,
+            "primaryKeyMatch": pk_match,
+        }
+    )
 
 
 # -------------------------
@@ -238,15 +516,15 @@ def _map_surveycto_type_to_pg(field_type: str) -> str:
 # -------------------------
 
 @router.post("/connect", response_model=PostgresConnectionResponse)
-def connect(credentials: PostgresCredentials) -> PostgresConnectionResponse:
+def connect(credentials: PostgresCredentials) -> Response:
     if not credentials.host.strip():
-        return PostgresConnectionResponse(success=False, error="Host is required")
+        return _connect_error("Host is required")
     if not credentials.database.strip():
-        return PostgresConnectionResponse(success=False, error="Database name is required")
+        return _connect_error("Database name is required")
     if not credentials.username.strip():
-        return PostgresConnectionResponse(success=False, error="Username is required")
+        return _connect_error("Username is required")
     if not credentials.password.strip():
-        return PostgresConnectionResponse(success=False, error="Password is required")
+        return _connect_error("Password is required")
 
     creds = postgres_service.PgCredentials(
         host=credentials.host.strip(),
@@ -257,186 +535,195 @@ def connect(credentials: PostgresCredentials) -> PostgresConnectionResponse:
         sslmode=credentials.sslMode,
     )
 
+    # The new pool's first connection doubles as the credential check and
+    # is the one the catalog is read on, so /connect pays one handshake.
     try:
-        conn = psycopg2.connect(
-            host=creds.host,
-            port=creds.port,
-            dbname=creds.database,
-            user=creds.username,
-            password=creds.password,
-            sslmode=creds.sslmode,
-            connect_timeout=10,
-        )
+        pool = postgres_service.open_pool(creds)
     except psycopg2.Error as exc:
-        return PostgresConnectionResponse(success=False, error=str(exc))
+        return _connect_error(str(exc))
 
-    postgres_service.set_credentials(creds)
+    postgres_service.set_credentials(creds, pool=pool)
     postgres_session.set_credentials(creds)
 
     try:
-        schemas: list[PostgresSchema] = []
-        schema_names = _fetch_schemas(conn)
-        for s in schema_names:
-            table_names = _fetch_tables(conn, s)
-            tables: list[PostgresTable] = []
-            for t in table_names:
-                cols = _fetch_columns(conn, s, t)
-                pk = next((c.name for c in cols if c.isPrimaryKey), None)
-                tables.append(
-                    PostgresTable(
-                        name=t,
-                        primaryKey=pk,
-                        rowCount=0,
-                        columns=cols,
-                    )
-                )
-            schemas.append(PostgresSchema(name=s, tables=tables))
-
-        return PostgresConnectionResponse(success=True, schemas=schemas)
-    except Exception as exc:
-        return PostgresConnectionResponse(success=False, error=f"Connected, but failed to load schemas: {exc}")
-    finally:
-        conn.close()
-
-
-@router.get("/schemas", response_model=list[PostgresSchema])
-def list_schemas() -> list[PostgresSchema]:
-    conn = _connect()
-    try:
-        schema_names = _fetch_schemas(conn)
-        result: list[PostgresSchema] = []
-
-        for s in schema_names:
-            table_names = _fetch_tables(conn, s)
-            tables: list[PostgresTable] = []
-            for t in table_names:
-                cols = _fetch_columns(conn, s, t)
-                pk = next((c.name for c in cols if c.isPrimaryKey), None)
-                tables.append(
-                    PostgresTable(
-                        name=t,
-                        primaryKey=pk,
-                        rowCount=0,
-                        columns=cols,
-                    )
-                )
-            result.append(PostgresSchema(name=s, tables=tables))
-
-        return result
-    finally:
-        conn.close()
-
-
-@router.get("/schemas/{schema_name}/tables", response_model=list[PostgresTable])
-def list_tables(schema_name: str) -> list[PostgresTable]:
-    conn = _connect()
-    try:
-        table_names = _fetch_tables(conn, schema_name)
-        tables: list[PostgresTable] = []
-        for t in table_names:
-            cols = _fetch_columns(conn, schema_name, t)
-            pk = next((c.name for c in cols if c.isPrimaryKey), None)
-            tables.append(
-                PostgresTable(
-                    name=t,
-                    primaryKey=pk,
-                    rowCount=0,
-                    columns=cols,
-                )
-            )
-        return tables
-    finally:
-        conn.close()
-
-
-@router.post("/validate-schema", response_model=SchemaCompatibility)
-def validate_schema(payload: ValidateSchemaRequest) -> SchemaCompatibility:
-    conn = _connect()
-
+        conn = postgres_service.connect()
+    except psycopg2.Error as exc:
+        return _connect_error(str(exc))
     try:
-        table_names = _fetch_tables(conn, payload.targetSchema)
-        if payload.targetTable not in table_names:
-            return SchemaCompatibility(
-                compatible=False,
-                missingColumns=[f.name for f in payload.formFields],
-                extraColumns=[],
-                typeMismatches=[],
-                primaryKeyMatch=False,
-            )
+        schemas = _fetch_catalog(conn)
+        chunks = [orjson.dumps(s) for s in schemas]
     except Exception as exc:
-        raise HTTPException(status_code=500, detail=f"Failed to validate schema: {exc}") from exc
-
-    cols = _fetch_columns(conn, payload.targetSchema, payload.targetTable)
-    table_col_map: Dict[str, PostgresColumn] = {c.name: c for c in cols}
+        return _connect_error(f"Connected, but failed to load schemas: {exc}")
+    finally:
+        postgres_service.release(conn)
+
+    postgres_session.index_schemas(schemas)
+    postgres_session.cache_schemas(chunks)
+
+    def _body() -> Iterator[bytes]:
+        yield b'{"success":true,"schemas":'
+        yield from _iter_json_array(chunks)
+        yield b',"error":null}'
+
+    return StreamingResponse(_body(), media_type="application/json")
+
+
+# Optional keyset paging for the listings below: names sort the same way
+# in the index and in the catalog query (the name type uses C collation).
+_PAGE_LIMIT = Query(None, ge=1, le=1000)
+
+
+def _page_response(items: list, names: list[str], after: Optional[str], limit: Optional[int]) -> Response:
+    """Encode the page of ``items`` (sorted, with their ``names``) that follows ``after``.
+
+    X-Next-After carries the last name sent while more items remain.
+    """
+    start = bisect_right(names, after) if after is not None else 0
+    end = len(items) if limit is None else start + limit
+    page = items[start:end]
+    headers = {"X-Next-After": page[-1].name} if page and end < len(items) else None
+    return Response(content=orjson.dumps(page), media_type="application/json", headers=headers)
+
+
+@router.get(
+    "/schemas",
+    response_model=list[PostgresSchema],
+    dependencies=_REQUIRES_CONNECTION,
+)
+def list_schemas(after: Optional[str] = None, limit: Optional[int] = _PAGE_LIMIT) -> Response:
+    if after is not None or limit is not None:
+        listing = postgres_session.get_schema_listing()
+        if listing is None:
+            with _connection() as conn:
+                schemas = _fetch_catalog(conn)
+            postgres_session.index_schemas(schemas)
+            listing = postgres_session.get_schema_listing() or (schemas, [s.name for s in schemas])
+        return _page_response(*listing, after, limit)
+
+    cached = postgres_session.get_cached_schemas()
+    if cached is None:
+        schemas = postgres_session.get_indexed_schemas()
+        if schemas is None:
+            with _connection() as conn:
+                schemas = _fetch_catalog(conn)
+            postgres_session.index_schemas(schemas)
+        cached = [orjson.dumps(s) for s in schemas]
+        postgres_session.cache_schemas(cached)
+    return StreamingResponse(_iter_json_array(cached), media_type="application/json")
+
+
+@router.get(
+    "/schemas/{schema_name}/tables",
+    response_model=list[PostgresTable],
+    dependencies=_REQUIRES_CONNECTION,
+)
+def list_tables(schema_name: str, after: Optional[str] = None, limit: Optional[int] = _PAGE_LIMIT) -> Response:
+    if after is not None or limit is not None:
+        listing = postgres_session.get_table_listing(schema_name)
+        if listing is None:
+            with _connection() as conn:
+                catalog = _fetch_catalog(conn, schema_name)
+            tables = list(catalog[0].tables) if catalog else []
+            listing = (tables, [t.name for t in tables])
+        return _page_response(*listing, after, limit)
+
+    cached = postgres_session.get_cached_tables(schema_name)
+    if cached is None:
+        tables = postgres_session.get_indexed_tables(schema_name)
+        if tables is None:
+            with _connection() as conn:
+                catalog = _fetch_catalog(conn, schema_name)
+            tables = list(catalog[0].tables) if catalog else []
+        cached = orjson.dumps(tables)
+        postgres_session.cache_tables(schema_name, cached)
+    return Response(content=cached, media_type="application/json")
+
+
+@router.post(
+    "/validate-schema",
+    response_model=SchemaCompatibility,
+    dependencies=_REQUIRES_CONNECTION,
+    openapi_extra=_json_body_openapi(ValidateSchemaRequest),
+)
+def validate_schema(
+    payload: ValidateSchemaRequest = Depends(_json_body(ValidateSchemaRequest)),
+) -> Response:
+    table = postgres_session.find_table(payload.targetSchema, payload.targetTable)
+    if table is None:
+        # Not in the reflection index (or index not built yet): ask the catalog.
+        with _connection() as conn:
+            try:
+                table = _fetch_table(conn, payload.targetSchema, payload.targetTable)
+            except Exception as exc:
+                raise HTTPException(status_code=500, detail=f"Failed to validate schema: {exc}") from exc
+
+    if table is None:
+        return _compatibility_response(
+            compatible=False,
+            missing=[f.name for f in payload.formFields],
+            extra=[],
+            type_mismatches=[],
+            pk_match=False,
+        )
 
-    form_names = {f.name for f in payload.formFields}
-    table_names_set = set(table_col_map.keys())
+    col_types = postgres_session.get_column_lookup(payload.targetSchema, payload.targetTable)
+    if col_types is None:
+        col_types = postgres_session.build_column_lookup(table.columns)
 
-    missing = sorted(list(form_names - table_names_set))
-    extra = sorted(list(table_names_set - form_names))
+    form_pk, missing, extra, type_mismatches = _diff_schemas(payload.formFields, col_types)
 
-    type_mismatches: list[dict] = []
-    for f in payload.formFields:
-        if f.name in table_col_map:
-            expected = _map_surveycto_type_to_pg(f.type)
-            actual = table_col_map[f.name].type
-            if expected != actual and not (expected == "NUMERIC" and actual in {"INTEGER", "BIGINT", "NUMERIC"}):
-                type_mismatches.append({"field": f.name, "expected": expected, "actual": actual})
-
-    form_pk = next((f.name for f in payload.formFields if f.isPrimaryKey), None)
-    table_pk = next((c.name for c in cols if c.isPrimaryKey), None)
+    table_pk = table.primaryKey
     pk_match = (form_pk is not None) and (table_pk == form_pk)
 
     compatible = (len(missing) == 0) and (len(type_mismatches) == 0)
 
-    return SchemaCompatibility(
+    return _compatibility_response(
         compatible=compatible,
-        missingColumns=missing,
-        extraColumns=extra,
-        typeMismatches=type_mismatches,
-        primaryKeyMatch=pk_match,
+        missing=missing,
+        extra=extra,
+        type_mismatches=type_mismatches,
+        pk_match=pk_match,
     )
 
 
-@router.post("/tables", response_model=CreateTableResponse)
-def create_table(payload: CreateTableRequest) -> CreateTableResponse:
+@router.post(
+    "/tables",
+    response_model=CreateTableResponse,
+    dependencies=_REQUIRES_CONNECTION,
+    openapi_extra=_json_body_openapi(CreateTableRequest),
+)
+def create_table(
+    payload: CreateTableRequest = Depends(_json_body(CreateTableRequest)),
+) -> CreateTableResponse:
     if not payload.schemaName.strip():
         return CreateTableResponse(success=False, error="schemaName is required")
     if not payload.tableName.strip():
         return CreateTableResponse(success=False, error="tableName is required")
 
-    pk = next((c.name for c in payload.columns if c.isPrimaryKey), None)
-
-    conn = _connect()
-    try:
-        with conn.cursor() as cur:
-            cur.execute(sql.SQL("CREATE SCHEMA IF NOT EXISTS {}")
-                        .format(sql.Identifier(payload.schemaName)))
-
-            col_defs: list[sql.SQL] = []
-            for c in payload.columns:
-                col_type = _coerce_allowed_type(c.type)
-                col_defs.append(
-                    sql.SQL("{} {} {}").format(
-                        sql.Identifier(c.name),
-                        sql.SQL(col_type),
-                        sql.SQL("NULL" if c.nullable else "NOT NULL"),
-                    )
-                )
-
-            if pk:
-                col_defs.append(sql.SQL("PRIMARY KEY ({})").format(sql.Identifier(pk)))
-
-            stmt = sql.SQL("CREATE TABLE IF NOT EXISTS {}.{} ({})").format(
-                sql.Identifier(payload.schemaName),
-                sql.Identifier(payload.tableName),
-                sql.SQL(", ").join(col_defs),
-            )
-            cur.execute(stmt)
-        conn.commit()
-    except Exception as exc:
-        return CreateTableResponse(success=False, error=f"Failed to create table: {exc}")
-    finally:
-        conn.close()
-
+    pk: Optional[str] = None
+    columns: list[tuple[str, str, bool]] = []
+    for c in payload.columns:
+        if c.isPrimaryKey and pk is None:
+            pk = c.name
+        columns.append((c.name, _coerce_allowed_type(c.type), c.nullable))
+
+    stmt = _build_create_table_sql(payload.schemaName, payload.tableName, tuple(columns), pk)
+    with _connection() as conn:
+        try:
+            with conn.cursor() as cur:
+                cur.execute(stmt)
+        except Exception as exc:
+            return CreateTableResponse(success=False, error=f"Failed to create table: {exc}")
+
+    postgres_session.add_table(
+        payload.schemaName,
+        PgTable(
+            name=payload.tableName,
+            columns=tuple(
+                PgColumn(name=name, type=col_type, nullable=nullable and name != pk, isPrimaryKey=name == pk)
+                for name, col_type, nullable in columns
+            ),
+            primaryKey=pk,
+        ),
+    )
     return CreateTableResponse(success=True)
@@ -13,6 +13,7 @@ instead of "0".
 """
 
 from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 
 from app.services import surveycto_service
@@ -29,13 +30,15 @@ class SurveyCTOFormResponse(BaseModel):
 @router.get("/forms", response_model=list[SurveyCTOFormResponse])
 async def list_forms(
     session_token: str = Query(..., description="Session token from /sessions"),
-) -> list[SurveyCTOFormResponse]:
+) -> ORJSONResponse:
     try:
         forms = await surveycto_service.list_forms(session_token)
     except surveycto_service.InvalidSessionError as exc:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(exc)) from exc
     except surveycto_service.AuthenticationError as exc:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(exc)) from exc
+    except surveycto_service.ApiNotFoundError as exc:
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc)) from exc
     except surveycto_service.ApiAccessError as exc:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(exc)) from exc
     except surveycto_service.ServerConnectionError as exc:
@@ -43,11 +46,7 @@ async def list_forms(
     except surveycto_service.FormListParseError as exc:
         raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc)) from exc
 
-    return [
-        SurveyCTOFormResponse(
-            form_id=f.form_id,
-            title=f.title,
-            version=f.version or "1",
-        )
-        for f in forms
-    ]
+    # Plain dicts straight to orjson; response_model stays for the schema.
+    return ORJSONResponse(
+        [{"form_id": f.form_id, "title": f.title, "version": f.version or "1"} for f in forms]
+    )
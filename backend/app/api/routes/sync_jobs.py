@@ -1,52 +1,76 @@
 from __future__ import annotations
 
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Any, Literal
+from typing import Any, Iterator, Literal
 
-from fastapi import APIRouter, BackgroundTasks, HTTPException, Path, status
-from pydantic import BaseModel, Field
+import orjson
+
+from fastapi import APIRouter, HTTPException, Path, Request, Response, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field
 
 from app.services import sync_engine, sync_runner
 
 
-router = APIRouter(prefix="/api/sync-jobs", tags=["sync-jobs"])
+router = APIRouter(prefix="/api/sync-jobs", tags=["sync-jobs"], default_response_class=ORJSONResponse)
+
+# Syncs can take minutes. Running them as BackgroundTasks would hold one of
+# the server's request threads each, so they get their own bounded pool;
+# jobs beyond the limit queue up in it.
+_MAX_CONCURRENT_SYNCS = 4
+_SYNC_POOL = ThreadPoolExecutor(max_workers=_MAX_CONCURRENT_SYNCS, thread_name_prefix="sync-job")
+# job_id -> future, until the run finishes (lets delete cancel a queued run).
+_RUNS: dict[int, Future] = {}
+
+
+def _submit_run(job_id: int, started_at: datetime) -> None:
+    future = _SYNC_POOL.submit(_run_and_persist, job_id, started_at)
+    _RUNS[job_id] = future
+    future.add_done_callback(lambda _: _RUNS.pop(job_id, None))
+
+
+def shutdown_runs() -> None:
+    """Stop taking runs and fail the ones still queued.
+
+    Called on app shutdown. Queued jobs were created as running, so without
+    this they would stay "running" in the store after the process exits.
+    Runs already executing are left to finish.
+    """
+    for job_id, future in list(_RUNS.items()):
+        if future.cancel():
+            msg = "Server shut down before the job started."
+            sync_engine.finalize_job(
+                job_id,
+                status="failed",
+                last_error=msg,
+                completed_at=datetime.now(tz=timezone.utc),
+                errors=[{"recordId": "backend", "field": None, "message": msg}],
+            )
+    _SYNC_POOL.shutdown(wait=False, cancel_futures=True)
 
 
-def _run_and_persist(job_id: int) -> None:
-    """Run a sync job and persist its final progress.
+def _run_and_persist(job_id: int, started_at: datetime | None = None) -> None:
+    """Run a sync job in the background.
 
-    This is meant to be executed as a FastAPI BackgroundTask so the POST request
-    can return quickly and the UI can poll GET /api/sync-jobs/{id}.
+    This is meant to be executed on _SYNC_POOL so the POST request can return
+    quickly and the UI can poll GET /api/sync-jobs/{id}. The runner persists
+    progress itself on every path.
 
     IMPORTANT: never allow an exception to escape this function, otherwise the
     job may remain stuck in "running" and the UI will poll forever.
     """
     try:
-        result = sync_runner.run_sync_job(job_id)
-
-        # Persist progress back in engine store
-        sync_engine.mark_progress(
-            job_id,
-            status="completed" if result.status == "completed" else "failed",
-            processed_records=result.processed_records,
-            total_records=result.total_records,
-            inserted_records=result.inserted_records,
-            updated_records=result.updated_records,
-            completed_at=result.completed_at,
-            errors=result.errors,
-        )
-        sync_engine.record_sync_completion(
-            job_id,
-            "completed" if result.status == "completed" else "failed",
-            None if result.status == "completed" else (result.errors[-1]["message"] if result.errors else "failed"),
-        )
-
+        sync_runner.run_sync_job(job_id, started_at=started_at)
     except Exception as exc:
         # ✅ Never leave a job in "running" if the background task crashes
         msg = f"Background task crashed: {exc}"
-        sync_engine.mark_progress(
+        sync_engine.finalize_job(
             job_id,
             status="failed",
+            last_error=msg,
             processed_records=0,
             total_records=0,
             inserted_records=0,
@@ -54,7 +78,6 @@ def _run_and_persist(job_id: int) -> None:
             completed_at=datetime.now(tz=timezone.utc),
             errors=[{"recordId": "backend", "field": None, "message": msg}],
         )
-        sync_engine.record_sync_completion(job_id, "failed", msg)
 
 
 # -------------------------
@@ -71,13 +94,25 @@ class SyncJobConfig(BaseModel):
     sessionToken: str = Field(..., description="SurveyCTO session token from /sessions")
 
 
+# Response-only models (see routes/postgres.py): the routes return pre-encoded
+# bodies, so these only feed the OpenAPI schema.
+_RESPONSE_ONLY = ConfigDict(defer_build=True)
+
+
 class SyncError(BaseModel):
+    model_config = _RESPONSE_ONLY
+
     recordId: str
     field: str | None = None
     message: str
 
 
+_TERMINAL_STATUSES = frozenset({"completed", "failed"})
+
+
 class SyncProgress(BaseModel):
+    model_config = _RESPONSE_ONLY
+
     jobId: str
     status: Literal["pending", "running", "completed", "failed"]
     processedRecords: int
@@ -87,131 +122,256 @@ class SyncProgress(BaseModel):
     errors: list[SyncError]
     startedAt: str | None = None
     completedAt: str | None = None
+    # True once the job is completed/failed: its progress will not change
+    # unless it is re-run, so clients can stop polling.
+    terminal: bool = False
 
 
-def _progress_from_engine(progress: dict[str, Any]) -> SyncProgress:
-    # Ensure all fields exist exactly as the frontend expects
-    raw_errors = progress.get("errors") or []
-    errors: list[SyncError] = []
-    for e in raw_errors:
-        # tolerate older shapes
-        errors.append(
-            SyncError(
-                recordId=str(e.get("recordId") or e.get("id") or "unknown"),
-                field=e.get("field"),
-                message=str(e.get("message") or "Unknown error"),
-            )
-        )
+def _progress_from_engine(progress: dict[str, Any]) -> dict[str, Any]:
+    """SyncProgress-shaped dict for a row from our own store.
 
-    return SyncProgress(
-        jobId=str(progress.get("jobId")),
-        status=progress.get("status", "pending"),
-        processedRecords=int(progress.get("processedRecords") or 0),
-        totalRecords=int(progress.get("totalRecords") or 0),
-        insertedRecords=int(progress.get("insertedRecords") or 0),
-        updatedRecords=int(progress.get("updatedRecords") or 0),
-        errors=errors,
-        startedAt=progress.get("startedAt"),
-        completedAt=progress.get("completedAt"),
-    )
+    _progress_row_to_dict already emits the camelCase keys with coerced
+    counters, so the dict is reused as-is and only the free-form errors are
+    normalized. Routes encode it directly with ORJSONResponse; SyncProgress
+    stays as the response_model for the OpenAPI schema.
+    """
+    progress["terminal"] = progress["status"] in _TERMINAL_STATUSES
+    errors = progress.get("errors")
+    if not errors:
+        # Completed jobs, i.e. most of the list.
+        progress["errors"] = []
+        return progress
+
+    # tolerate older error shapes
+    progress["errors"] = [
+        {
+            "recordId": str(e.get("recordId") or e.get("id") or "unknown"),
+            "field": e.get("field"),
+            "message": str(e.get("message") or "Unknown error"),
+        }
+        for e in errors
+    ]
+    return progress
+
+
+def _progress_response(progress: dict[str, Any] | None) -> ORJSONResponse:
+    """Single exit for the routes that return one SyncProgress."""
+    if not progress:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sync job not found")
+    return ORJSONResponse(_progress_from_engine(progress))
+
+
+# (etag, encoded list) from the last full listing. Pollers without a matching
+# If-None-Match (a fresh tab, a second client) get these bytes as long as the
+# progress version has not moved, instead of a re-query and re-encode.
+_LIST_BODY: tuple[str, bytes] | None = None
+# job_id -> (job state tag, encoded progress) behind the last listing. A
+# rebuild only re-reads and re-encodes jobs whose tag moved, typically the
+# one or two that are running, and splices the rest back in.
+_LIST_ITEMS: dict[int, tuple[str, bytes]] = {}
+
+
+def _encode_progress_list() -> bytes:
+    global _LIST_ITEMS
+    job_ids = sync_engine.list_progress_job_ids()
+    # Tags before rows, so a racing write leaves a stale tag, not stale bytes.
+    tags = sync_engine.job_state_tags(job_ids)
+    previous = _LIST_ITEMS
+    items: dict[int, tuple[str, bytes]] = {}
+    stale: list[int] = []
+    for job_id in job_ids:
+        cached = previous.get(job_id)
+        if cached is not None and cached[0] == tags[job_id]:
+            items[job_id] = cached
+        else:
+            stale.append(job_id)
+    if stale:
+        for progress in sync_engine.get_progress_many(stale):
+            job_id = int(progress["jobId"])
+            items[job_id] = (tags[job_id], orjson.dumps(_progress_from_engine(progress)))
+    _LIST_ITEMS = items
+    return b"[" + b",".join(items[j][1] for j in job_ids if j in items) + b"]"
 
 
 @router.get("", response_model=list[SyncProgress])
-def list_sync_jobs() -> list[SyncProgress]:
-    jobs = sync_engine.list_sync_jobs_progress()
-    return [_progress_from_engine(j) for j in jobs]
+def list_sync_jobs(request: Request) -> Response:
+    # The UI polls this; answer unchanged state with a bodiless 304.
+    etag = f'W/"{sync_engine.progress_state_tag()}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    global _LIST_BODY
+    cached = _LIST_BODY
+    if cached is not None and cached[0] == etag:
+        body = cached[1]
+    else:
+        body = _encode_progress_list()
+        _LIST_BODY = (etag, body)
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
 
+def _ndjson_progress() -> Iterator[bytes]:
+    for progress in sync_engine.iter_sync_jobs_progress():
+        yield orjson.dumps(_progress_from_engine(progress)) + b"\n"
 
-@router.delete("/completed")
-def clear_completed_jobs() -> dict[str, int]:
+
+@router.get("/stream")
+def stream_sync_jobs() -> StreamingResponse:
+    # Same rows as GET "", one JSON object per line, sent as they are read.
+    return StreamingResponse(_ndjson_progress(), media_type="application/x-ndjson")
+
+
+@router.get("/_pool", response_model=dict[str, int])
+def sync_pool_status() -> ORJSONResponse:
+    # Backpressure from _SYNC_POOL: runs executing vs. waiting for a worker.
+    runs = list(_RUNS.values())
+    in_flight = sum(1 for f in runs if f.running())
+    return ORJSONResponse(
+        {"maxConcurrent": _MAX_CONCURRENT_SYNCS, "inFlight": in_flight, "waiting": len(runs) - in_flight}
+    )
+
+
+@router.delete("/completed", response_model=dict[str, int])
+def clear_completed_jobs() -> ORJSONResponse:
     count = sync_engine.clear_completed_jobs()
-    return {"deleted": count}
+    with _TERMINAL_BODIES_LOCK:
+        _TERMINAL_BODIES.clear()
+    return ORJSONResponse({"deleted": count})
+
+
+# job_id -> (job state tag, encoded progress) for finished jobs, whose
+# progress only changes again if they are re-run or deleted (both move the tag).
+_TERMINAL_BODIES: dict[int, tuple[str, bytes]] = {}
+_TERMINAL_BODIES_MAX = 1024
+_TERMINAL_BODIES_LOCK = threading.Lock()
+
+
+def _remember_terminal_body(job_id: int, tag: str, body: bytes) -> None:
+    with _TERMINAL_BODIES_LOCK:
+        _TERMINAL_BODIES.pop(job_id, None)
+        if len(_TERMINAL_BODIES) >= _TERMINAL_BODIES_MAX:
+            # Oldest first: dicts keep insertion order.
+            del _TERMINAL_BODIES[next(iter(_TERMINAL_BODIES))]
+        _TERMINAL_BODIES[job_id] = (tag, body)
 
 
 @router.get("/{job_id}", response_model=SyncProgress)
-def get_sync_job(job_id: int = Path(..., ge=1)) -> SyncProgress:
+def get_sync_job(request: Request, job_id: int = Path(..., ge=1)) -> Response:
+    # Same conditional-request scheme as the list, scoped to this job.
+    tag = sync_engine.job_state_tag(job_id)
+    etag = f'W/"{tag}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    cached = _TERMINAL_BODIES.get(job_id)
+    if cached is not None and cached[0] == tag:
+        return Response(content=cached[1], media_type="application/json", headers={"ETag": etag})
+
     progress = sync_engine.get_progress(job_id)
-    if not progress:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sync job not found")
-    return _progress_from_engine(progress)
+    if not progress or progress["status"] not in _TERMINAL_STATUSES:
+        with _TERMINAL_BODIES_LOCK:
+            _TERMINAL_BODIES.pop(job_id, None)
+        response = _progress_response(progress)
+        response.headers["ETag"] = etag
+        return response
+
+    body = orjson.dumps(_progress_from_engine(progress))
+    _remember_terminal_body(job_id, tag, body)
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
 
+# Writes wake the socket through a progress listener; this re-check only
+# bounds the wait in case a wake-up is ever lost. An idle check costs no I/O.
+_WS_RECHECK_SECONDS = 5.0
 
-@router.delete("/{job_id}")
-def delete_sync_job(job_id: int = Path(..., ge=1)) -> dict[str, str]:
+
+@router.websocket("/{job_id}/ws")
+async def watch_sync_job(websocket: WebSocket, job_id: int = Path(..., ge=1)) -> None:
+    """Push the job's progress each time it changes, then close once it is finished.
+
+    Each write to the job sets an event via sync_engine's progress
+    listeners, so the socket wakes right after a change instead of polling.
+    GET /{job_id} stays for polling clients.
+    """
+    await websocket.accept()
+    loop = asyncio.get_running_loop()
+    changed = asyncio.Event()
+
+    def on_progress(job_ids: tuple[int, ...]) -> None:
+        if not job_ids or job_id in job_ids:
+            try:
+                loop.call_soon_threadsafe(changed.set)
+            except RuntimeError:
+                pass  # loop already closed (shutdown)
+
+    sync_engine.add_progress_listener(on_progress)
+    sent_tag: str | None = None
+    try:
+        while True:
+            # Clear before reading the tag: a write landing after the read
+            # sets the event again, so it cannot be missed.
+            changed.clear()
+            tag = sync_engine.job_state_tag(job_id)
+            if tag != sent_tag:
+                progress = await asyncio.to_thread(sync_engine.get_progress, job_id)
+                if not progress:
+                    await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Sync job not found")
+                    return
+                sent_tag = tag
+                await websocket.send_text(orjson.dumps(_progress_from_engine(progress)).decode())
+                if progress["status"] in _TERMINAL_STATUSES:
+                    await websocket.close()
+                    return
+            try:
+                await asyncio.wait_for(changed.wait(), _WS_RECHECK_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sync_engine.remove_progress_listener(on_progress)
+
+
+@router.delete("/{job_id}", response_model=dict[str, str])
+def delete_sync_job(job_id: int = Path(..., ge=1)) -> ORJSONResponse:
+    # A run still waiting for a pool slot is dropped; a started one finishes.
+    run = _RUNS.get(job_id)
+    if run is not None:
+        run.cancel()
     deleted = sync_engine.delete_sync_job(job_id)
+    with _TERMINAL_BODIES_LOCK:
+        _TERMINAL_BODIES.pop(job_id, None)
     if not deleted:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sync job not found")
-    return {"status": "ok"}
+    return ORJSONResponse({"status": "ok"})
 
 
 @router.post("", response_model=SyncProgress)
-def create_sync_job(config: SyncJobConfig, background_tasks: BackgroundTasks) -> SyncProgress:
+def create_sync_job(config: SyncJobConfig) -> ORJSONResponse:
     if config.syncMode == "upsert" and not config.primaryKeyField:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail="primaryKeyField is required when syncMode is 'upsert'.",
         )
 
-    job_id = sync_engine.create_sync_job(config.model_dump())
-
-    # Mark running and start in the background so the UI can poll.
-    sync_engine.mark_progress(
-        job_id,
-        status="running",
-        started_at=datetime.now(tz=timezone.utc),
-    )
-    background_tasks.add_task(_run_and_persist, job_id)
+    # Create it already running and start in the background so the UI can poll.
+    started_at = datetime.now(tz=timezone.utc)
+    job_id = sync_engine.create_sync_job(config.model_dump(), started_at=started_at)
+    _submit_run(job_id, started_at)
 
     progress = sync_engine.get_progress(job_id)
     if not progress:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to create sync job")
 
-    return _progress_from_engine(progress)
+    return _progress_response(progress)
 
 
 @router.post("/{job_id}/run", response_model=SyncProgress)
-def run_sync_job(job_id: int = Path(..., ge=1)) -> SyncProgress:
-    # Mark running early so UI can react
-    sync_engine.mark_progress(
-        job_id,
-        status="running",
-        started_at=datetime.now(tz=timezone.utc),
-    )
-
-    result = sync_runner.run_sync_job(job_id)
-
-    # Persist progress back in engine store
-    if result.status == "completed":
-        sync_engine.mark_progress(
-            job_id,
-            status="completed",
-            processed_records=result.processed_records,
-            total_records=result.total_records,
-            inserted_records=result.inserted_records,
-            updated_records=result.updated_records,
-            completed_at=result.completed_at,
-            errors=result.errors,
-        )
-        sync_engine.record_sync_completion(job_id, "completed", None)
-    else:
-        sync_engine.mark_progress(
-            job_id,
-            status="failed",
-            processed_records=result.processed_records,
-            total_records=result.total_records,
-            inserted_records=result.inserted_records,
-            updated_records=result.updated_records,
-            completed_at=result.completed_at,
-            errors=result.errors,
-        )
-        sync_engine.record_sync_completion(
-            job_id,
-            "failed",
-            result.errors[-1]["message"] if result.errors else "failed",
-        )
+def run_sync_job(job_id: int = Path(..., ge=1)) -> ORJSONResponse:
+    # The runner marks the job running up front and persists the final
+    # progress/status itself, so only the result needs reading back.
+    # Same wrapper as background runs: a crash still finalizes the job.
+    _run_and_persist(job_id)
 
     progress = sync_engine.get_progress(job_id)
-    if not progress:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sync job not found")
-
-    return _progress_from_engine(progress)
+    return _progress_response(progress)
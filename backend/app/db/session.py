@@ -1,25 +1,98 @@
 from __future__ import annotations
 
+import queue
 import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Iterator
 
 DB_PATH = Path(__file__).resolve().parent / "internal.db"
 
+# Idle connections kept for reuse. Every route, runner and poll touches the
+# job store, so reusing connections saves the open (and its schema parse)
+# and keeps SQLite's page cache warm between calls.
+_POOL_SIZE = 8
+_POOL: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue(maxsize=_POOL_SIZE)
 
-def get_connection() -> sqlite3.Connection:
-    connection = sqlite3.connect(DB_PATH)
+
+def _connect() -> sqlite3.Connection:
+    # Connections move between worker threads, one user at a time.
+    connection = sqlite3.connect(DB_PATH, check_same_thread=False)
     connection.row_factory = sqlite3.Row
+    # Per-connection settings; journal_mode=WAL is persistent in the file and
+    # set once by init_db(). NORMAL is durable under WAL except for the last
+    # commits on power loss, fine for job bookkeeping. The busy wait comes
+    # from sqlite3.connect's default 5s timeout.
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.execute("PRAGMA temp_store=MEMORY")
+    connection.execute("PRAGMA cache_size=-32000")  # ~32 MB page cache
+    connection.execute("PRAGMA mmap_size=268435456")  # 256 MB
     return connection
 
 
+@contextmanager
+def get_connection() -> Iterator[sqlite3.Connection]:
+    """Borrow a pooled connection for a ``with`` block.
+
+    Commits when the block succeeds and rolls back if it raises, like
+    ``with sqlite3.connect(...)``, then hands the connection back.
+    """
+    try:
+        connection = _POOL.get_nowait()
+    except queue.Empty:
+        connection = _connect()
+    try:
+        with connection:
+            yield connection
+    finally:
+        try:
+            _POOL.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+
+# SQLite allows one writer at a time anyway. Queueing writers on a Python
+# lock hands the file over as soon as the previous commit lands, instead of
+# leaving them in SQLite's sleep-and-retry busy handler; readers (WAL) never
+# wait on it.
+_WRITE_LOCK = threading.Lock()
+
+
+@contextmanager
+def write_connection() -> Iterator[sqlite3.Connection]:
+    """Like get_connection(), for blocks that write.
+
+    Holds the process-wide write lock and opens the transaction with BEGIN
+    IMMEDIATE, so a read-then-write block never hits SQLITE_BUSY when it
+    upgrades to a write.
+    """
+    with _WRITE_LOCK, get_connection() as connection:
+        connection.execute("BEGIN IMMEDIATE")
+        yield connection
+
+
 def _column_exists(conn: sqlite3.Connection, table: str, column: str) -> bool:
     rows = conn.execute(f"PRAGMA table_info({table})").fetchall()
     return any(r["name"] == column for r in rows)
 
 
+# Bump whenever the DDL in init_db() changes. Files already stamped with it
+# (PRAGMA user_version) skip the whole migration at startup.
+SCHEMA_VERSION = 1
+
+
 def init_db() -> None:
     DB_PATH.parent.mkdir(parents=True, exist_ok=True)
     with get_connection() as connection:
+        # WAL lets polls read while a runner writes. The mode sticks to the
+        # database file, so internal.db-wal and internal.db-shm sit next to it.
+        connection.execute("PRAGMA journal_mode=WAL")
+        if connection.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+            return
+
+    # One write transaction for all DDL; committed when the block exits.
+    with write_connection() as connection:
         connection.execute(
             """
             CREATE TABLE IF NOT EXISTS sync_jobs (
@@ -78,4 +151,17 @@ def init_db() -> None:
             )
             """
         )
-        connection.commit()
+
+        connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS surveycto_sessions (
+                token TEXT PRIMARY KEY,
+                expires_at TEXT NOT NULL,
+                username TEXT NOT NULL,
+                password TEXT NOT NULL,
+                server_url TEXT NOT NULL,
+                created_at TEXT NOT NULL
+            )
+            """
+        )
+        connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
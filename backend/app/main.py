@@ -1,10 +1,12 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.api.routes import postgres, sessions, surveycto, sync_jobs
 from app.db.session import init_db
+from app.services import postgres_service, surveycto_service
 
-app = FastAPI(title="SurveySync Connect Backend")
+app = FastAPI(title="SurveySync Connect Backend", default_response_class=ORJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -19,12 +21,21 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Keyset cursor of the paged /api/pg listings.
+    expose_headers=["X-Next-After"],
 )
 
 @app.on_event("startup")
 def on_startup() -> None:
     init_db()
 
+
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    sync_jobs.shutdown_runs()
+    postgres_service.close_pool()
+    await surveycto_service.close_clients()
+
 app.include_router(sessions.router)
 app.include_router(surveycto.router)
 app.include_router(postgres.router)
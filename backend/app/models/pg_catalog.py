@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+# Field names are camelCase on purpose: orjson serializes dataclasses by
+# field name, so these encode straight to the shapes in src/api/types.ts.
+
+
+@dataclass(frozen=True, slots=True)
+class PgColumn:
+    name: str
+    type: str
+    nullable: bool = True
+    isPrimaryKey: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class PgTable:
+    name: str
+    columns: tuple[PgColumn, ...]
+    primaryKey: Optional[str] = None
+    rowCount: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class PgSchema:
+    name: str
+    tables: tuple[PgTable, ...]
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import threading
+import time
 from dataclasses import dataclass
 from typing import Optional
 
 import psycopg2
+from psycopg2 import pool as pg_pool
 
 
 @dataclass
@@ -18,10 +21,54 @@ class PgCredentials:
 
 _PG_CREDS: Optional[PgCredentials] = None
 
+class _Pool(pg_pool.ThreadedConnectionPool):
+    def _putconn(self, conn, key=None, close=False):
+        # The base pool closes a returned connection once minconn are idle,
+        # so concurrent borrows past the first would each pay a handshake.
+        # Keep up to maxconn warm instead; minconn only sizes the eager open.
+        # (Called with self._lock held by putconn().)
+        minconn = self.minconn
+        self.minconn = self.maxconn
+        try:
+            super()._putconn(conn, key, close)
+        finally:
+            self.minconn = minconn
 
-def set_credentials(creds: PgCredentials) -> None:
-    global _PG_CREDS
-    _PG_CREDS = creds
+    def retire(self) -> None:
+        """Close the idle connections and refuse further use.
+
+        Unlike closeall(), connections still checked out stay open for their
+        borrower; release() closes them when they come back.
+        """
+        with self._lock:
+            for conn in self._pool:
+                conn.close()
+            self._pool = []
+            self.closed = True
+
+
+# Shared pool for the API routes, built lazily from the stored credentials.
+_POOL: Optional[_Pool] = None
+_POOL_LOCK = threading.Lock()
+_POOL_MIN_CONN = 1
+_POOL_MAX_CONN = 10
+# Only connections idle longer than this are pinged before reuse.
+_PING_AFTER_IDLE_SECONDS = 30.0
+# id(conn) -> time.monotonic() when it was handed back to the pool.
+_RETURNED_AT: dict[int, float] = {}
+
+
+def set_credentials(creds: PgCredentials, *, pool: Optional[_Pool] = None) -> None:
+    """Store ``creds``, replacing the pool; pass ``pool`` (from open_pool) to install it."""
+    global _PG_CREDS, _POOL
+    # Swapped in one critical section, so a concurrent get_pool() can't open
+    # a pool for the new credentials in between and have it overwritten.
+    with _POOL_LOCK:
+        _PG_CREDS = creds
+        old, _POOL = _POOL, pool
+        _RETURNED_AT.clear()
+    if old is not None:
+        old.retire()
 
 
 def get_credentials() -> PgCredentials:
@@ -30,13 +77,120 @@ def get_credentials() -> PgCredentials:
     return _PG_CREDS
 
 
-def connect() -> psycopg2.extensions.connection:
-    creds = get_credentials()
-    return psycopg2.connect(
-        host=creds.host,
-        port=creds.port,
-        dbname=creds.database,
-        user=creds.username,
-        password=creds.password,
-        sslmode=creds.sslmode,
+def connection_kwargs(creds: PgCredentials, **extra) -> dict:
+    """psycopg2.connect() keyword arguments for ``creds`` (plus any overrides)."""
+    kwargs = {
+        "host": creds.host,
+        "port": creds.port,
+        "dbname": creds.database,
+        "user": creds.username,
+        "password": creds.password,
+        "sslmode": creds.sslmode,
+        "connect_timeout": 10,
+    }
+    kwargs.update(extra)
+    return kwargs
+
+
+def _app_connection_kwargs(creds: PgCredentials) -> dict:
+    return connection_kwargs(
+        creds,
+        # Sync jobs hold a connection for a whole write; keepalives catch
+        # providers/poolers that drop quiet sockets.
+        keepalives=1,
+        keepalives_idle=30,
+        keepalives_interval=10,
+        keepalives_count=5,
+        application_name="surveysync-connect",
     )
+
+
+def open_pool(creds: PgCredentials) -> _Pool:
+    """Open a pool for ``creds``. Its first connection is made right away,
+    so this raises psycopg2.Error if the server rejects them."""
+    return _Pool(_POOL_MIN_CONN, _POOL_MAX_CONN, **_app_connection_kwargs(creds))
+
+
+def open_connection(creds: PgCredentials) -> psycopg2.extensions.connection:
+    """A dedicated connection outside the shared pool; the caller closes it.
+
+    Sync runs use these: they hold a connection for a whole write, which
+    must neither take a route's pool slot nor be cut off when the pool is
+    replaced, and retries must reach the database the run started on.
+    """
+    return psycopg2.connect(**_app_connection_kwargs(creds))
+
+
+def get_pool() -> _Pool:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = open_pool(get_credentials())
+        return _POOL
+
+
+def close_pool() -> None:
+    global _POOL
+    with _POOL_LOCK:
+        old, _POOL = _POOL, None
+        _RETURNED_AT.clear()
+    if old is not None:
+        old.retire()
+
+
+def _is_alive(conn: psycopg2.extensions.connection) -> bool:
+    if conn.closed:
+        return False
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT 1")
+        return True
+    except (psycopg2.OperationalError, psycopg2.InterfaceError):
+        return False
+
+
+def connect() -> psycopg2.extensions.connection:
+    """Borrow a live connection from the shared pool. Hand it back with release().
+
+    Pooled connections run in autocommit mode: the API only issues catalog
+    reads and self-contained DDL, and this saves the BEGIN round-trip before
+    the first query and the ROLLBACK the pool issues on return. Callers that
+    need a transaction switch it off for their borrow.
+
+    Idle pooled connections can be dropped by the server or a proxy, so ones
+    that sat unused for a while are pinged first and discarded if dead.
+    """
+    pool = get_pool()
+    for _ in range(_POOL_MAX_CONN):
+        conn = pool.getconn()
+        returned_at = _RETURNED_AT.pop(id(conn), None)
+        if conn.closed:
+            pool.putconn(conn, close=True)
+            continue
+        if not conn.autocommit:
+            conn.autocommit = True
+        if returned_at is None or time.monotonic() - returned_at <= _PING_AFTER_IDLE_SECONDS:
+            return conn
+        if _is_alive(conn):
+            return conn
+        pool.putconn(conn, close=True)
+    # Fresh connections skip the ping, so only a run of dead or just-closed
+    # ones gets here; don't hand out one that was never checked.
+    raise psycopg2.OperationalError("Could not get a live connection from the Postgres pool")
+
+
+def release(conn: psycopg2.extensions.connection, *, discard: bool = False) -> None:
+    """Hand a connection back to the pool; ``discard`` closes it instead of reusing it."""
+    pool = _POOL
+    try:
+        if pool is None:
+            raise pg_pool.PoolError("connection pool is closed")
+        pool.putconn(conn, close=discard)
+        # putconn() may have closed it (discard, or pool already full); a
+        # timestamp for a dead object could be inherited by a new one via id().
+        if not conn.closed:
+            _RETURNED_AT[id(conn)] = time.monotonic()
+    except pg_pool.PoolError:
+        # The pool was rebuilt (new credentials) or retired while this
+        # connection was checked out.
+        conn.close()
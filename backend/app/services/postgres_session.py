@@ -1,8 +1,11 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import threading
+import time
+from dataclasses import dataclass, field
 from typing import Optional
 
+from app.models.pg_catalog import PgColumn, PgSchema, PgTable
 from app.services import postgres_service
 
 
@@ -10,22 +13,180 @@ from app.services import postgres_service
 class PgSession:
     connected: bool = False
     creds: Optional[postgres_service.PgCredentials] = None
+    # Pre-serialized reflection payloads; only reset by connect / DDL we issue.
+    # Schemas are kept as one JSON chunk per schema so they can be streamed.
+    schemas_cache_chunks: Optional[list[bytes]] = None
+    tables_cache: dict[str, bytes] = field(default_factory=dict)
+    # {schema: {table: PgTable}}; None until a full reflection has run.
+    schema_index: Optional[dict[str, dict[str, PgTable]]] = None
+    # {(schema, table): {column: normalized type}} derived lazily from the
+    # index so validate_schema does not rebuild it per request.
+    column_lookup: dict[tuple[str, str], dict[str, str]] = field(default_factory=dict)
+    # Name-sorted views of schema_index plus their names (for bisecting a
+    # paging cursor), built on first use and dropped whenever the index changes.
+    schema_listing: Optional[tuple[list[PgSchema], list[str]]] = None
+    table_listings: dict[str, tuple[list[PgTable], list[str]]] = field(default_factory=dict)
+    # time.monotonic() of the first cache fill since the last invalidation.
+    cache_started_at: Optional[float] = None
 
 
 _PG_SESSION = PgSession()
 
+# Upper bound on how stale reflection can get when the catalog is changed
+# outside this app (our own DDL invalidates immediately).
+REFLECTION_TTL_SECONDS = 60.0
+
+# Routes run in FastAPI's threadpool, so cache reads/fills can interleave.
+_CACHE_LOCK = threading.RLock()
+
 
 def set_credentials(creds: postgres_service.PgCredentials) -> None:
     _PG_SESSION.connected = True
     _PG_SESSION.creds = creds
+    invalidate_schema_cache()
 
 
 def clear_credentials() -> None:
     _PG_SESSION.connected = False
     _PG_SESSION.creds = None
+    invalidate_schema_cache()
 
 
 def get_credentials() -> postgres_service.PgCredentials:
     if not _PG_SESSION.connected or not _PG_SESSION.creds:
         raise RuntimeError("Postgres is not connected")
     return _PG_SESSION.creds
+
+
+# -------------------------
+# Reflection cache
+# -------------------------
+
+def _expire_if_stale() -> None:
+    started = _PG_SESSION.cache_started_at
+    if started is not None and time.monotonic() - started > REFLECTION_TTL_SECONDS:
+        invalidate_schema_cache()
+
+
+def _mark_filled() -> None:
+    if _PG_SESSION.cache_started_at is None:
+        _PG_SESSION.cache_started_at = time.monotonic()
+
+
+def get_cached_schemas() -> Optional[list[bytes]]:
+    with _CACHE_LOCK:
+        _expire_if_stale()
+        return _PG_SESSION.schemas_cache_chunks
+
+
+def cache_schemas(chunks: list[bytes]) -> None:
+    with _CACHE_LOCK:
+        _mark_filled()
+        _PG_SESSION.schemas_cache_chunks = chunks
+
+
+def get_cached_tables(schema: str) -> Optional[bytes]:
+    with _CACHE_LOCK:
+        _expire_if_stale()
+        return _PG_SESSION.tables_cache.get(schema)
+
+
+def cache_tables(schema: str, payload: bytes) -> None:
+    with _CACHE_LOCK:
+        _mark_filled()
+        _PG_SESSION.tables_cache[schema] = payload
+
+
+def index_schemas(schemas: list[PgSchema]) -> None:
+    with _CACHE_LOCK:
+        _mark_filled()
+        _PG_SESSION.column_lookup.clear()
+        _PG_SESSION.schema_listing = None
+        _PG_SESSION.table_listings.clear()
+        _PG_SESSION.schema_index = {s.name: {t.name: t for t in s.tables} for s in schemas}
+
+
+def find_table(schema: str, table: str) -> Optional[PgTable]:
+    with _CACHE_LOCK:
+        _expire_if_stale()
+        if _PG_SESSION.schema_index is None:
+            return None
+        return _PG_SESSION.schema_index.get(schema, {}).get(table)
+
+
+def build_column_lookup(columns: tuple[PgColumn, ...]) -> dict[str, str]:
+    """Column name -> normalized type, in catalog (attnum) order."""
+    return {c.name: c.type for c in columns}
+
+
+def get_column_lookup(schema: str, table: str) -> Optional[dict[str, str]]:
+    key = (schema, table)
+    with _CACHE_LOCK:
+        lookup = _PG_SESSION.column_lookup.get(key)
+        if lookup is None:
+            indexed = find_table(schema, table)
+            if indexed is None:
+                return None
+            lookup = _PG_SESSION.column_lookup[key] = build_column_lookup(indexed.columns)
+        return lookup
+
+
+def get_table_listing(schema: str) -> Optional[tuple[list[PgTable], list[str]]]:
+    """(tables sorted by name, their names) for an indexed schema. Shared; don't mutate."""
+    with _CACHE_LOCK:
+        _expire_if_stale()
+        if _PG_SESSION.schema_index is None or schema not in _PG_SESSION.schema_index:
+            return None
+        listing = _PG_SESSION.table_listings.get(schema)
+        if listing is None:
+            tables = _PG_SESSION.schema_index[schema]
+            names = sorted(tables)
+            listing = _PG_SESSION.table_listings[schema] = ([tables[name] for name in names], names)
+        return listing
+
+
+def get_indexed_tables(schema: str) -> Optional[list[PgTable]]:
+    listing = get_table_listing(schema)
+    return None if listing is None else listing[0]
+
+
+def get_schema_listing() -> Optional[tuple[list[PgSchema], list[str]]]:
+    """(schemas sorted by name, their names) from the index. Shared; don't mutate."""
+    with _CACHE_LOCK:
+        _expire_if_stale()
+        if _PG_SESSION.schema_index is None:
+            return None
+        listing = _PG_SESSION.schema_listing
+        if listing is None:
+            names = sorted(_PG_SESSION.schema_index)
+            schemas = [PgSchema(name=name, tables=tuple(get_indexed_tables(name))) for name in names]
+            listing = _PG_SESSION.schema_listing = (schemas, names)
+        return listing
+
+
+def get_indexed_schemas() -> Optional[list[PgSchema]]:
+    listing = get_schema_listing()
+    return None if listing is None else listing[0]
+
+
+def add_table(schema: str, table: PgTable) -> None:
+    """Record a table we just created without re-reflecting the catalog."""
+    with _CACHE_LOCK:
+        _PG_SESSION.schemas_cache_chunks = None
+        _PG_SESSION.tables_cache.pop(schema, None)
+        _PG_SESSION.column_lookup.pop((schema, table.name), None)
+        _PG_SESSION.schema_listing = None
+        _PG_SESSION.table_listings.pop(schema, None)
+        if _PG_SESSION.schema_index is not None:
+            _PG_SESSION.schema_index.setdefault(schema, {}).setdefault(table.name, table)
+
+
+def invalidate_schema_cache() -> None:
+    with _CACHE_LOCK:
+        _PG_SESSION.schemas_cache_chunks = None
+        _PG_SESSION.tables_cache.clear()
+        _PG_SESSION.schema_index = None
+        _PG_SESSION.column_lookup.clear()
+        _PG_SESSION.schema_listing = None
+        _PG_SESSION.table_listings.clear()
+        _PG_SESSION.cache_started_at = None
@@ -1,17 +1,20 @@
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
 from typing import Iterable
 from urllib.parse import urlparse
 import xml.etree.ElementTree as ElementTree
-import json
 import re
-import asyncio
+import threading
+import time
 
 import httpx
+import orjson
 
-from app.db.session import get_connection
+from app.db.session import get_connection, write_connection
 
 
 # -------------------------
@@ -56,6 +59,13 @@ class ApiAccessError(SurveyCTOServiceError):
         self.status_code = status_code
 
 
+class ApiNotFoundError(ApiAccessError):
+    """The SurveyCTO server has no such endpoint (HTTP 404)."""
+
+    def __init__(self, message: str) -> None:
+        super().__init__(message, status_code=404)
+
+
 class ServerConnectionError(SurveyCTOServiceError):
     pass
 
@@ -84,26 +94,8 @@ class SubmissionsRateLimitError(SubmissionsFetchError):
 # SQLite session persistence
 # -------------------------
 
-def _ensure_sessions_table() -> None:
-    with get_connection() as conn:
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS surveycto_sessions (
-                token TEXT PRIMARY KEY,
-                expires_at TEXT NOT NULL,
-                username TEXT NOT NULL,
-                password TEXT NOT NULL,
-                server_url TEXT NOT NULL,
-                created_at TEXT NOT NULL
-            )
-            """
-        )
-        conn.commit()
-
-
 def _save_session(session: SessionInfo) -> None:
-    _ensure_sessions_table()
-    with get_connection() as conn:
+    with write_connection() as conn:
         conn.execute(
             """
             INSERT OR REPLACE INTO surveycto_sessions
@@ -124,7 +116,6 @@ def _save_session(session: SessionInfo) -> None:
 
 
 def _load_session(token: str) -> SessionInfo | None:
-    _ensure_sessions_table()
     with get_connection() as conn:
         row = conn.execute(
             """
@@ -152,12 +143,51 @@ def _load_session(token: str) -> SessionInfo | None:
 
 
 def _delete_session(token: str) -> None:
-    _ensure_sessions_table()
-    with get_connection() as conn:
+    with write_connection() as conn:
         conn.execute("DELETE FROM surveycto_sessions WHERE token = ?", (token,))
         conn.commit()
 
 
+# -------------------------
+# Shared HTTP clients
+# -------------------------
+
+# One keep-alive pool per client, so repeated SurveyCTO calls skip the
+# TCP + TLS handshake. The async client serves the API routes (it is bound
+# to the server's event loop, so it is created lazily inside it); the sync
+# client serves the sync runner, which runs in worker threads.
+_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+_ASYNC_CLIENT: httpx.AsyncClient | None = None
+_SYNC_CLIENT: httpx.Client | None = None
+_SYNC_CLIENT_LOCK = threading.Lock()
+
+
+def _async_client() -> httpx.AsyncClient:
+    global _ASYNC_CLIENT
+    if _ASYNC_CLIENT is None or _ASYNC_CLIENT.is_closed:
+        _ASYNC_CLIENT = httpx.AsyncClient(limits=_HTTP_LIMITS, timeout=httpx.Timeout(20.0), follow_redirects=True)
+    return _ASYNC_CLIENT
+
+
+def _sync_client() -> httpx.Client:
+    global _SYNC_CLIENT
+    with _SYNC_CLIENT_LOCK:
+        if _SYNC_CLIENT is None or _SYNC_CLIENT.is_closed:
+            _SYNC_CLIENT = httpx.Client(limits=_HTTP_LIMITS, timeout=httpx.Timeout(60.0), follow_redirects=True)
+        return _SYNC_CLIENT
+
+
+async def close_clients() -> None:
+    global _ASYNC_CLIENT, _SYNC_CLIENT
+    if _ASYNC_CLIENT is not None:
+        await _ASYNC_CLIENT.aclose()
+        _ASYNC_CLIENT = None
+    with _SYNC_CLIENT_LOCK:
+        if _SYNC_CLIENT is not None:
+            _SYNC_CLIENT.close()
+            _SYNC_CLIENT = None
+
+
 # -------------------------
 # Helpers
 # -------------------------
@@ -236,14 +266,14 @@ def _extract_retry_after_seconds(resp: httpx.Response) -> int | None:
     return None
 
 
-async def _get_once(client: httpx.AsyncClient, url: str, *, auth: tuple[str, str], headers: dict | None = None) -> httpx.Response:
+def _get_once(client: httpx.Client, url: str, *, auth: tuple[str, str], headers: dict | None = None) -> httpx.Response:
     """Single SurveyCTO GET request.
 
     Important: we do NOT sleep/retry inside backend jobs when SurveyCTO returns
     HTTP 417. Instead we surface a SubmissionsRateLimitError so the caller can
     record a cooldown and the UI can instruct the user to retry later.
     """
-    return await client.get(url, auth=auth, headers=headers)
+    return client.get(url, auth=auth, headers=headers)
 
 
 # -------------------------
@@ -297,19 +327,18 @@ async def _fetch_form_list(session: SessionInfo) -> str:
     }
 
     try:
-        async with httpx.AsyncClient(timeout=httpx.Timeout(20.0), follow_redirects=True) as client:
-            response = await client.get(
-                form_list_url,
-                auth=(session.username, session.password),
-                headers=headers,
-            )
+        response = await _async_client().get(
+            form_list_url,
+            auth=(session.username, session.password),
+            headers=headers,
+        )
     except httpx.RequestError as exc:
         raise ServerConnectionError("Unable to reach the SurveyCTO server.") from exc
 
     if response.status_code in {401, 403}:
         raise AuthenticationError("SurveyCTO credentials are invalid or access is denied.")
     if response.status_code == 404:
-        raise ApiAccessError("SurveyCTO form list endpoint was not found on this server.", status_code=404)
+        raise ApiNotFoundError("SurveyCTO form list endpoint was not found on this server.")
     if response.status_code >= 400:
         raise ApiAccessError(
             f"SurveyCTO form list request failed with status {response.status_code}.",
@@ -337,15 +366,14 @@ async def _fetch_form_ids(session: SessionInfo) -> Iterable[str]:
     headers = {"Accept": "application/json", "User-Agent": "SurveySync Connect"}
 
     try:
-        async with httpx.AsyncClient(timeout=httpx.Timeout(20.0), follow_redirects=True) as client:
-            response = await client.get(url, auth=(session.username, session.password), headers=headers)
+        response = await _async_client().get(url, auth=(session.username, session.password), headers=headers)
     except httpx.RequestError as exc:
         raise ServerConnectionError("Unable to reach the SurveyCTO server.") from exc
 
     if response.status_code in {401, 403}:
         raise AuthenticationError("SurveyCTO credentials are invalid or access is denied.")
     if response.status_code == 404:
-        raise ApiAccessError("SurveyCTO forms ids endpoint was not found on this server.", status_code=404)
+        raise ApiNotFoundError("SurveyCTO forms ids endpoint was not found on this server.")
     if response.status_code >= 400:
         raise ApiAccessError(
             f"SurveyCTO forms ids request failed with status {response.status_code}.",
@@ -382,12 +410,39 @@ async def _fetch_form_ids(session: SessionInfo) -> Iterable[str]:
     raise FormListParseError(f"Unexpected JSON type from forms ids: {type(payload).__name__}")
 
 
-async def list_forms(session_token: str) -> list[SurveyCTOForm]:
-    """
-    Prefer /formList (titles). Fall back to /api/v2/forms/ids (IDs only).
-    """
-    session = get_session(session_token)
+# Form lists change on the order of hours, but the UI asks for them on every
+# refresh. Keep each session's list for a minute; the per-token lock makes
+# concurrent misses share a single upstream call.
+_FORMS_TTL_SECONDS = 60.0
+_FORMS_CACHE_MAX = 1024
+_FORMS_CACHE: dict[str, tuple[float, list[SurveyCTOForm]]] = {}
+# token -> [lock, callers holding or waiting on it]. The entry is dropped
+# when the last caller leaves, never while someone still waits on the lock.
+_FORMS_LOCKS: dict[str, list] = {}
+
+
+def _cached_forms(session_token: str) -> list[SurveyCTOForm] | None:
+    entry = _FORMS_CACHE.get(session_token)
+    if entry is None:
+        return None
+    if entry[0] <= time.monotonic():
+        _FORMS_CACHE.pop(session_token, None)
+        return None
+    return entry[1]
+
 
+def _store_forms(session_token: str, forms: list[SurveyCTOForm]) -> None:
+    now = time.monotonic()
+    if len(_FORMS_CACHE) >= _FORMS_CACHE_MAX:
+        for key in [k for k, (expires, _) in _FORMS_CACHE.items() if expires <= now]:
+            del _FORMS_CACHE[key]
+        if len(_FORMS_CACHE) >= _FORMS_CACHE_MAX:
+            # Still full: drop the oldest insertion.
+            del _FORMS_CACHE[next(iter(_FORMS_CACHE))]
+    _FORMS_CACHE[session_token] = (now + _FORMS_TTL_SECONDS, forms)
+
+
+async def _fetch_forms(session: SessionInfo) -> list[SurveyCTOForm]:
     # 1) Prefer /formList (titles)
     try:
         xml_payload = await _fetch_form_list(session)
@@ -402,7 +457,42 @@ async def list_forms(session_token: str) -> list[SurveyCTOForm]:
     return [SurveyCTOForm(form_id=fid, title=fid, version="") for fid in form_ids]
 
 
-async def fetch_submissions_wide_json(
+async def list_forms(session_token: str) -> list[SurveyCTOForm]:
+    """
+    Prefer /formList (titles). Fall back to /api/v2/forms/ids (IDs only).
+    Results are cached per session for _FORMS_TTL_SECONDS.
+    """
+    # Session lookup is blocking SQLite I/O; keep it off the event loop.
+    # It still runs on cache hits so expired sessions are rejected.
+    try:
+        session = await asyncio.to_thread(get_session, session_token)
+    except InvalidSessionError:
+        _FORMS_CACHE.pop(session_token, None)
+        raise
+
+    forms = _cached_forms(session_token)
+    if forms is not None:
+        return forms
+
+    # Only touched from the event loop, so the count needs no lock of its own.
+    entry = _FORMS_LOCKS.get(session_token)
+    if entry is None:
+        entry = _FORMS_LOCKS[session_token] = [asyncio.Lock(), 0]
+    entry[1] += 1
+    try:
+        async with entry[0]:
+            forms = _cached_forms(session_token)
+            if forms is None:
+                forms = await _fetch_forms(session)
+                _store_forms(session_token, forms)
+    finally:
+        entry[1] -= 1
+        if not entry[1]:
+            _FORMS_LOCKS.pop(session_token, None)
+    return forms
+
+
+def fetch_submissions_wide_json(
     session_token: str,
     form_id: str,
     since_dt: datetime | None,
@@ -420,17 +510,25 @@ async def fetch_submissions_wide_json(
 
     url = f"{session.server_url}/api/v2/forms/data/wide/json/{form_id}?date={date_param}"
 
+    headers = {"User-Agent": "SurveySync Connect", "Accept": "application/json"}
+    if date_param:
+        # Same window as ?date=, as a conditional request: a server (or proxy)
+        # that honours it can answer 304 instead of an empty payload.
+        headers["If-Modified-Since"] = format_datetime(datetime.fromtimestamp(date_param, tz=timezone.utc), usegmt=True)
+
     try:
-        async with httpx.AsyncClient(timeout=httpx.Timeout(60.0), follow_redirects=True) as client:
-            resp = await _get_once(
-                client,
-                url,
-                auth=(session.username, session.password),
-                headers={"User-Agent": "SurveySync Connect", "Accept": "application/json"},
-            )
+        resp = _get_once(
+            _sync_client(),
+            url,
+            auth=(session.username, session.password),
+            headers=headers,
+        )
     except httpx.RequestError as exc:
         raise SubmissionsFetchError("Unable to reach the SurveyCTO server for submissions.") from exc
 
+    if resp.status_code == 304:
+        return []
+
     if resp.status_code in {401, 403}:
         raise AuthenticationError("SurveyCTO credentials are invalid or access is denied.")
 
@@ -448,13 +546,7 @@ async def fetch_submissions_wide_json(
             retry_after_seconds=None,
         )
 
-    # Still treat 412 as a hard error (usually constraints / API requirements)
-    if resp.status_code == 412:
-        snippet = (resp.text or "")[:400]
-        raise SubmissionsFetchError(
-            f"SurveyCTO submissions request failed with status {resp.status_code}. snippet={snippet!r}"
-        )
-
+    # Anything else >= 400 (including 412 constraint/API errors) is a hard error.
     if resp.status_code >= 400:
         snippet = (resp.text or "")[:400]
         raise SubmissionsFetchError(
@@ -469,20 +561,20 @@ async def fetch_submissions_wide_json(
             f"SurveyCTO submissions did not return JSON. content-type={ctype!r} snippet={snippet!r}"
         )
 
+    # orjson parses straight from the body bytes (no decoded str copy).
     try:
-        payload = resp.json()
-    except ValueError as exc:
+        payload = orjson.loads(resp.content)
+    except orjson.JSONDecodeError as exc:
         snippet = (resp.text or "")[:400]
         raise SubmissionsFetchError(f"SurveyCTO submissions invalid JSON. snippet={snippet!r}") from exc
+    # Drop the raw body so it isn't held alongside the parsed rows.
+    del resp
 
     if not isinstance(payload, list):
         raise SubmissionsFetchError(f"SurveyCTO submissions unexpected JSON type: {type(payload).__name__}")
 
-    # ensure dict rows
-    rows: list[dict] = []
-    for item in payload:
-        if isinstance(item, dict):
-            rows.append(item)
-        else:
-            rows.append({"_value": item})
-    return rows
+    # ensure dict rows (in place: no second list of the whole payload)
+    for i, item in enumerate(payload):
+        if not isinstance(item, dict):
+            payload[i] = {"_value": item}
+    return payload
@@ -5,16 +5,22 @@ from __future__ import annotations
 The frontend expects the following API shapes:
 - POST /api/sync-jobs creates a job and returns a *progress* object.
 - GET  /api/sync-jobs returns a list of *progress* objects.
+- GET  /api/sync-jobs/stream returns the same objects as NDJSON.
 - POST /api/sync-jobs/{id}/run updates progress, then returns progress.
 
 Those endpoints call the functions implemented in this module.
 """
 
-import json
+import threading
+import time
+import uuid
 from datetime import datetime, timezone
-from typing import Any
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Iterator
 
-from app.db.session import get_connection
+import orjson
+
+from app.db.session import get_connection, write_connection
 from app.models.last_sync import LastSyncMetadata
 from app.models.sync_job import SyncJob
 
@@ -23,29 +29,136 @@ def _utcnow() -> datetime:
     return datetime.now(tz=timezone.utc)
 
 
+# (epoch second, "YYYY-MM-DDTHH:MM:SS") of the last _utcnow_iso() call.
+_last_utcnow_second: tuple[int, str] = (-1, "")
+
+
+def _utcnow_iso() -> str:
+    """_utcnow().isoformat() at millisecond precision, without a datetime.
+
+    updated_at is stamped on every progress write. The date/time prefix is
+    formatted once per second; only the milliseconds change in between.
+    """
+    global _last_utcnow_second
+    second, ms = divmod(time.time_ns() // 1_000_000, 1000)
+    cached = _last_utcnow_second
+    if cached[0] != second:
+        cached = (second, time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second)))
+        _last_utcnow_second = cached
+    return f"{cached[1]}.{ms:03d}000+00:00"
+
+
+# Version of the job/progress listing, bumped after every write that can
+# change it. Lets GET /api/sync-jobs answer conditional requests without
+# touching SQLite. Process-local, like the rest of the app's session state;
+# the per-process epoch keeps tags from a previous run from matching.
+_PROGRESS_EPOCH = uuid.uuid4().hex[:12]
+_progress_version = 0
+# job_id -> _progress_version of the last write touching that job. Deleted
+# jobs are dropped so this only tracks jobs that still exist; jobs without
+# an entry share _job_version_floor, which moves on every deletion so a
+# removed job can never match a tag handed out before it was deleted.
+_job_versions: dict[int, int] = {}
+_job_version_floor = 0
+_PROGRESS_VERSION_LOCK = threading.Lock()
+# Called with the touched job ids after every bump (an empty tuple after a
+# deletion, which moves every untracked job's tag). They run on the writing
+# thread, so they must only hand off, e.g. via loop.call_soon_threadsafe.
+# Replaced, never mutated, so notifying needs no lock.
+_progress_listeners: tuple[Callable[[tuple[int, ...]], None], ...] = ()
+
+
+def add_progress_listener(listener: Callable[[tuple[int, ...]], None]) -> None:
+    global _progress_listeners
+    with _PROGRESS_VERSION_LOCK:
+        _progress_listeners = (*_progress_listeners, listener)
+
+
+def remove_progress_listener(listener: Callable[[tuple[int, ...]], None]) -> None:
+    global _progress_listeners
+    with _PROGRESS_VERSION_LOCK:
+        _progress_listeners = tuple(cb for cb in _progress_listeners if cb is not listener)
+
+
+def _notify_progress(job_ids: tuple[int, ...]) -> None:
+    for listener in _progress_listeners:
+        listener(job_ids)
+
+
+def _bump_progress_version(*job_ids: int) -> None:
+    global _progress_version
+    with _PROGRESS_VERSION_LOCK:
+        _progress_version += 1
+        for job_id in job_ids:
+            _job_versions[job_id] = _progress_version
+    _notify_progress(job_ids)
+
+
+def _forget_job_versions(job_ids: Iterable[int]) -> None:
+    global _progress_version, _job_version_floor
+    with _PROGRESS_VERSION_LOCK:
+        _progress_version += 1
+        _job_version_floor = _progress_version
+        for job_id in job_ids:
+            _job_versions.pop(job_id, None)
+    _notify_progress(())
+
+
+def progress_state_tag() -> str:
+    """Opaque tag that changes whenever list_sync_jobs_progress() may change.
+
+    Read it *before* querying, so a write racing the query yields a newer tag.
+    """
+    # A single int read is atomic, so pollers never wait on writers here.
+    return f"{_PROGRESS_EPOCH}-{_progress_version}"
+
+
+def job_state_tag(job_id: int) -> str:
+    """Like progress_state_tag(), but only moves on writes to this job."""
+    with _PROGRESS_VERSION_LOCK:
+        return f"{_PROGRESS_EPOCH}-{_job_versions.get(job_id, _job_version_floor)}"
+
+
+def job_state_tags(job_ids: Iterable[int]) -> dict[int, str]:
+    """job_state_tag() for many jobs under one lock acquisition."""
+    with _PROGRESS_VERSION_LOCK:
+        floor = _job_version_floor
+        return {job_id: f"{_PROGRESS_EPOCH}-{_job_versions.get(job_id, floor)}" for job_id in job_ids}
+
+
+# errors_json is decoded for every job on every uncached progress read, so
+# the store uses orjson too (compact UTF-8, same JSON as before).
 def _safe_json_dumps(obj: Any, default: Any = None) -> str:
     try:
-        return json.dumps(obj, ensure_ascii=False)
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
     except TypeError:
-        return json.dumps(default if default is not None else {}, ensure_ascii=False)
+        return orjson.dumps(default if default is not None else {}).decode()
 
 
 def _safe_json_loads(raw: str | None, default: Any) -> Any:
     if not raw:
         return default
     try:
-        return json.loads(raw)
-    except json.JSONDecodeError:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
         return default
 
 
 def _build_job_fields(config: dict[str, Any]) -> tuple[str, str, str]:
     """Derive name/source/target fields from the frontend config."""
-    form_id = str(config.get("formId") or "").strip()
-    schema = str(config.get("targetSchema") or "").strip()
-    table = str(config.get("targetTable") or "").strip()
+    return _job_fields(
+        str(config.get("formId") or "").strip(),
+        str(config.get("targetSchema") or "").strip(),
+        str(config.get("targetTable") or "").strip(),
+    )
+
 
-    name = f"sync_{form_id}_to_{schema}.{table}".strip()
+@lru_cache(maxsize=1024)
+def _job_fields(form_id: str, schema: str, table: str) -> tuple[str, str, str]:
+    # Pure function of the three ids; repeated creates/retries for the same
+    # form -> table pair reuse the built strings. The parts arrive stripped
+    # and the literals have no outer whitespace, so the name needs no strip().
+    name = f"sync_{form_id}_to_{schema}.{table}"
     if len(name) > 200:
         name = name[:200]
 
@@ -59,15 +172,17 @@ def _build_job_fields(config: dict[str, Any]) -> tuple[str, str, str]:
 # -----------------------------------------------------------------------------
 
 
-def create_sync_job(config: dict[str, Any]) -> int:
+def create_sync_job(config: dict[str, Any], *, started_at: datetime | None = None) -> int:
     """Create a new sync job and a corresponding progress row.
 
+    Pass ``started_at`` to create the job already "running" (saves a
+    separate mark_progress() round-trip when the caller starts it at once).
     Returns the created job id.
     """
-    timestamp = _utcnow()
+    timestamp = _utcnow_iso()
     name, source, target = _build_job_fields(config)
 
-    with get_connection() as connection:
+    with write_connection() as connection:
         cur = connection.execute(
             """
             INSERT INTO sync_jobs (name, source, target, status, created_at, updated_at, last_error, config_json)
@@ -77,9 +192,9 @@ def create_sync_job(config: dict[str, Any]) -> int:
                 name,
                 source,
                 target,
-                "queued",
-                timestamp.isoformat(),
-                timestamp.isoformat(),
+                "queued" if started_at is None else "running",
+                timestamp,
+                timestamp,
                 None,
                 _safe_json_dumps(config, default={}),
             ),
@@ -91,37 +206,47 @@ def create_sync_job(config: dict[str, Any]) -> int:
             INSERT OR REPLACE INTO sync_progress
               (job_id, status, processed_records, total_records, inserted_records, updated_records, errors_json, started_at, completed_at)
             VALUES
-              (?, ?, 0, 0, 0, 0, '[]', NULL, NULL)
+              (?, ?, 0, 0, 0, 0, '[]', ?, NULL)
             """,
-            (job_id, "pending"),
+            (
+                job_id,
+                "pending" if started_at is None else "running",
+                started_at.isoformat() if started_at is not None else None,
+            ),
         )
         connection.commit()
+    _bump_progress_version(job_id)
 
     return job_id
 
 
-def list_sync_jobs() -> list[SyncJob]:
-    with get_connection() as connection:
-        rows = connection.execute(
-            "SELECT id, name, source, target, status, created_at, updated_at, last_error, config_json FROM sync_jobs ORDER BY id DESC"
-        ).fetchall()
+_SYNC_JOB_COLUMNS = "id, name, source, target, status, created_at, updated_at, last_error, config_json"
 
-    jobs: list[SyncJob] = []
-    for row in rows:
-        jobs.append(
-            SyncJob(
-                id=int(row["id"]),
-                name=row["name"],
-                source=row["source"],
-                target=row["target"],
-                status=row["status"],
-                created_at=datetime.fromisoformat(row["created_at"]),
-                updated_at=datetime.fromisoformat(row["updated_at"]),
-                last_error=row["last_error"],
-                config=_safe_json_loads(row["config_json"], default={}),
-            )
-        )
-    return jobs
+
+def _row_to_sync_job(row) -> SyncJob:
+    return SyncJob(
+        id=int(row["id"]),
+        name=row["name"],
+        source=row["source"],
+        target=row["target"],
+        status=row["status"],
+        created_at=datetime.fromisoformat(row["created_at"]),
+        updated_at=datetime.fromisoformat(row["updated_at"]),
+        last_error=row["last_error"],
+        config=_safe_json_loads(row["config_json"], default={}),
+    )
+
+
+def get_sync_job(job_id: int) -> SyncJob | None:
+    """Fetch a single job by primary key (no full-table scan + decode)."""
+    with get_connection() as connection:
+        row = connection.execute(
+            f"SELECT {_SYNC_JOB_COLUMNS} FROM sync_jobs WHERE id = ?",
+            (job_id,),
+        ).fetchone()
+    if not row:
+        return None
+    return _row_to_sync_job(row)
 
 
 # -----------------------------------------------------------------------------
@@ -129,48 +254,93 @@ def list_sync_jobs() -> list[SyncJob]:
 # -----------------------------------------------------------------------------
 
 
+# Column order of every progress SELECT below; rows are unpacked by position.
+_PROGRESS_COLUMNS = (
+    "job_id, status, processed_records, total_records, inserted_records, "
+    "updated_records, errors_json, started_at, completed_at"
+)
+
+
 def _progress_row_to_dict(row) -> dict[str, Any]:
+    job_id, status, processed, total, inserted, updated, errors_json, started_at, completed_at = row
     return {
-        "jobId": str(row["job_id"]),
-        "status": row["status"],
-        "processedRecords": int(row["processed_records"] or 0),
-        "totalRecords": int(row["total_records"] or 0),
-        "insertedRecords": int(row["inserted_records"] or 0),
-        "updatedRecords": int(row["updated_records"] or 0),
-        "errors": _safe_json_loads(row["errors_json"], default=[]),
-        "startedAt": row["started_at"],
-        "completedAt": row["completed_at"],
+        "jobId": str(job_id),
+        "status": status,
+        # INTEGER columns: already ints, or NULL on rows from older versions.
+        "processedRecords": processed or 0,
+        "totalRecords": total or 0,
+        "insertedRecords": inserted or 0,
+        "updatedRecords": updated or 0,
+        "errors": _safe_json_loads(errors_json, default=[]),
+        "startedAt": started_at,
+        "completedAt": completed_at,
     }
 
 
+def _tuple_cursor(connection):
+    # Plain tuples: cheaper than sqlite3.Row, and only unpacked by position.
+    cur = connection.cursor()
+    cur.row_factory = None
+    return cur
+
+
+_LIST_PROGRESS_SQL = f"SELECT {_PROGRESS_COLUMNS} FROM sync_progress ORDER BY job_id DESC"
+
+
 def list_sync_jobs_progress() -> list[dict[str, Any]]:
     """Return all job progress in the exact camelCase keys the UI expects."""
     with get_connection() as connection:
-        rows = connection.execute(
-            """
-            SELECT
-              p.job_id, p.status, p.processed_records, p.total_records,
-              p.inserted_records, p.updated_records, p.errors_json,
-              p.started_at, p.completed_at
-            FROM sync_progress p
-            ORDER BY p.job_id DESC
-            """
-        ).fetchall()
+        rows = _tuple_cursor(connection).execute(_LIST_PROGRESS_SQL).fetchall()
 
     return [_progress_row_to_dict(r) for r in rows]
 
 
+def iter_sync_jobs_progress() -> Iterator[dict[str, Any]]:
+    """Generator version of list_sync_jobs_progress().
+
+    The raw rows are fetched up front and the connection goes straight back:
+    a slow streaming client must not hold a pool slot or pin a WAL read
+    snapshot. Only the conversion (errors_json decoding) is deferred.
+    """
+    with get_connection() as connection:
+        rows = _tuple_cursor(connection).execute(_LIST_PROGRESS_SQL).fetchall()
+    for row in rows:
+        yield _progress_row_to_dict(row)
+
+
+def list_progress_job_ids() -> list[int]:
+    """Job ids in list_sync_jobs_progress() order, read off the primary key."""
+    with get_connection() as connection:
+        rows = _tuple_cursor(connection).execute(
+            "SELECT job_id FROM sync_progress ORDER BY job_id DESC"
+        ).fetchall()
+    return [r[0] for r in rows]
+
+
+# Stays well under SQLite's bound-parameter limit.
+_IN_CHUNK = 500
+
+
+def get_progress_many(job_ids: list[int]) -> list[dict[str, Any]]:
+    """get_progress() for several jobs; ids that no longer exist are skipped."""
+    out: list[dict[str, Any]] = []
+    with get_connection() as connection:
+        cur = _tuple_cursor(connection)
+        for i in range(0, len(job_ids), _IN_CHUNK):
+            chunk = job_ids[i : i + _IN_CHUNK]
+            marks = ",".join("?" * len(chunk))
+            rows = cur.execute(
+                f"SELECT {_PROGRESS_COLUMNS} FROM sync_progress WHERE job_id IN ({marks})",
+                chunk,
+            ).fetchall()
+            out.extend(_progress_row_to_dict(r) for r in rows)
+    return out
+
+
 def get_progress(job_id: int) -> dict[str, Any] | None:
     with get_connection() as connection:
         row = connection.execute(
-            """
-            SELECT
-              job_id, status, processed_records, total_records,
-              inserted_records, updated_records, errors_json,
-              started_at, completed_at
-            FROM sync_progress
-            WHERE job_id = ?
-            """,
+            f"SELECT {_PROGRESS_COLUMNS} FROM sync_progress WHERE job_id = ?",
             (job_id,),
         ).fetchone()
 
@@ -192,7 +362,7 @@ def mark_progress(
     completed_at: datetime | None = None,
 ) -> None:
     """Update progress fields safely (partial updates allowed)."""
-    with get_connection() as connection:
+    with write_connection() as connection:
         current = connection.execute(
             "SELECT * FROM sync_progress WHERE job_id = ?",
             (job_id,),
@@ -210,6 +380,7 @@ def mark_progress(
                 (job_id, status or "pending"),
             )
             connection.commit()
+            _bump_progress_version(job_id)
             return
 
         new_status = status or current["status"]
@@ -252,9 +423,109 @@ def mark_progress(
         # Keep sync_jobs.status roughly aligned for admin/debugging
         connection.execute(
             "UPDATE sync_jobs SET status = ?, updated_at = ? WHERE id = ?",
-            (new_status, _utcnow().isoformat(), job_id),
+            (new_status, _utcnow_iso(), job_id),
         )
         connection.commit()
+    _bump_progress_version(job_id)
+
+
+class ProgressBuffer:
+    """Accumulates a running job's counters and persists them in batches.
+
+    Each mark_progress() call is a read-modify-write commit, so writers report
+    through add() and the counters only hit SQLite once flush_every records
+    have accumulated or flush_interval seconds have passed. Leaving the
+    ``with`` block flushes whatever is still pending, also on errors.
+    """
+
+    def __init__(self, job_id: int, *, flush_every: int = 500, flush_interval: float = 1.0) -> None:
+        self.job_id = job_id
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.processed = 0
+        self.inserted = 0
+        self.updated = 0
+        self._pending = 0
+        self._flushed_at = time.monotonic()
+
+    def add(self, *, processed: int = 0, inserted: int = 0, updated: int = 0) -> None:
+        self.processed += processed
+        self.inserted += inserted
+        self.updated += updated
+        self._pending += processed
+        if self._pending >= self.flush_every or time.monotonic() - self._flushed_at >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        mark_progress(
+            self.job_id,
+            processed_records=self.processed,
+            inserted_records=self.inserted,
+            updated_records=self.updated,
+        )
+        self._pending = 0
+        self._flushed_at = time.monotonic()
+
+    def __enter__(self) -> ProgressBuffer:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.flush()
+
+
+def finalize_job(
+    job_id: int,
+    *,
+    status: str,
+    errors: list[dict[str, Any]],
+    completed_at: datetime,
+    last_error: str | None = None,
+    processed_records: int | None = None,
+    total_records: int | None = None,
+    inserted_records: int | None = None,
+    updated_records: int | None = None,
+) -> None:
+    """Write a job's terminal state to sync_progress and sync_jobs at once.
+
+    Equivalent to record_sync_completion() followed by mark_progress(), but
+    as one transaction without mark_progress()'s read of the current row:
+    counters left as None keep their stored value via COALESCE.
+    """
+    counters = (processed_records, total_records, inserted_records, updated_records)
+    errors_json = _safe_json_dumps(errors, default=[])
+    with write_connection() as connection:
+        cur = connection.execute(
+            """
+            UPDATE sync_progress
+            SET status = ?,
+                processed_records = COALESCE(?, processed_records),
+                total_records = COALESCE(?, total_records),
+                inserted_records = COALESCE(?, inserted_records),
+                updated_records = COALESCE(?, updated_records),
+                errors_json = ?, completed_at = ?
+            WHERE job_id = ?
+            """,
+            (status, *counters, errors_json, completed_at.isoformat(), job_id),
+        )
+        if cur.rowcount == 0:
+            # Create if missing (defensive)
+            connection.execute(
+                """
+                INSERT INTO sync_progress
+                  (job_id, status, processed_records, total_records, inserted_records, updated_records, errors_json, started_at, completed_at)
+                VALUES
+                  (?, ?, ?, ?, ?, ?, ?, NULL, ?)
+                """,
+                (job_id, status, *(int(c or 0) for c in counters), errors_json, completed_at.isoformat()),
+            )
+        connection.execute(
+            "UPDATE sync_jobs SET status = ?, updated_at = ?, last_error = ? WHERE id = ?",
+            (status, _utcnow_iso(), last_error, job_id),
+        )
+        connection.commit()
+    _bump_progress_version(job_id)
 
 
 # -----------------------------------------------------------------------------
@@ -263,7 +534,7 @@ def mark_progress(
 
 
 def upsert_last_sync(source: str, target: str, last_synced_at: datetime) -> LastSyncMetadata:
-    with get_connection() as connection:
+    with write_connection() as connection:
         connection.execute(
             """
             INSERT INTO last_sync (source, target, last_synced_at)
@@ -286,12 +557,11 @@ def upsert_last_sync(source: str, target: str, last_synced_at: datetime) -> Last
     )
 
 
-def get_last_sync(source: str, target: str) -> LastSyncMetadata | None:
-    with get_connection() as connection:
-        row = connection.execute(
-            "SELECT id, source, target, last_synced_at FROM last_sync WHERE source = ? AND target = ?",
-            (source, target),
-        ).fetchone()
+def _last_sync_from(connection, source: str, target: str) -> LastSyncMetadata | None:
+    row = connection.execute(
+        "SELECT id, source, target, last_synced_at FROM last_sync WHERE source = ? AND target = ?",
+        (source, target),
+    ).fetchone()
     if not row:
         return None
     return LastSyncMetadata(
@@ -302,6 +572,23 @@ def get_last_sync(source: str, target: str) -> LastSyncMetadata | None:
     )
 
 
+def get_last_sync(source: str, target: str) -> LastSyncMetadata | None:
+    with get_connection() as connection:
+        return _last_sync_from(connection, source, target)
+
+
+def get_sync_state(source: str, target: str) -> tuple[datetime | None, LastSyncMetadata | None]:
+    """Active SurveyCTO cooldown and last-sync metadata over one connection.
+
+    The runner needs both before every fetch; see get_surveycto_cooldown()
+    and get_last_sync() for the individual semantics.
+    """
+    with get_connection() as connection:
+        cooldown_until, stale = _cooldown_from(connection, source)
+        last_sync = None if cooldown_until is not None else _last_sync_from(connection, source, target)
+    if stale is not None:
+        _drop_stale_cooldown(source, stale)
+    return cooldown_until, last_sync
 
 
 # -----------------------------------------------------------------------------
@@ -315,10 +602,10 @@ def record_sync_completion(job_id: int, status: str, last_error: str | None) ->
     Note: progress is stored/updated via mark_progress(); this function just keeps
     sync_jobs (status/last_error) aligned.
     """
-    with get_connection() as connection:
+    with write_connection() as connection:
         connection.execute(
             "UPDATE sync_jobs SET status = ?, updated_at = ?, last_error = ? WHERE id = ?",
-            (status, _utcnow().isoformat(), last_error, job_id),
+            (status, _utcnow_iso(), last_error, job_id),
         )
         connection.commit()
 
@@ -338,67 +625,86 @@ def set_surveycto_cooldown(source: str, cooldown_until: datetime) -> None:
     if cooldown_until.tzinfo is None:
         cooldown_until = cooldown_until.replace(tzinfo=timezone.utc)
 
-    with get_connection() as connection:
+    with write_connection() as connection:
         connection.execute(
             """
             INSERT INTO surveycto_cooldowns (source, cooldown_until, created_at)
             VALUES (?, ?, ?)
             ON CONFLICT(source) DO UPDATE SET cooldown_until = excluded.cooldown_until
             """,
-            (source, cooldown_until.isoformat(), _utcnow().isoformat()),
+            (source, cooldown_until.isoformat(), _utcnow_iso()),
         )
         connection.commit()
 
 
-def get_surveycto_cooldown(source: str) -> datetime | None:
-    """Return cooldown_until if the cooldown is still active, else None."""
-    with get_connection() as connection:
-        row = connection.execute(
-            "SELECT cooldown_until FROM surveycto_cooldowns WHERE source = ?",
-            (source,),
-        ).fetchone()
+def _cooldown_from(connection, source: str) -> tuple[datetime | None, str | None]:
+    """(active cooldown_until or None, stored value to clean up or None).
 
-        if not row:
-            return None
+    Read-only, so it can run on a get_connection() block: an expired or
+    corrupt row is reported back and deleted by _drop_stale_cooldown()
+    through write_connection() once the read is done.
+    """
+    row = connection.execute(
+        "SELECT cooldown_until FROM surveycto_cooldowns WHERE source = ?",
+        (source,),
+    ).fetchone()
 
-        try:
-            cooldown_until = datetime.fromisoformat(row["cooldown_until"])
-        except Exception:
-            # If corrupted, clear
-            connection.execute("DELETE FROM surveycto_cooldowns WHERE source = ?", (source,))
-            connection.commit()
-            return None
+    if not row:
+        return None, None
 
-        if cooldown_until.tzinfo is None:
-            cooldown_until = cooldown_until.replace(tzinfo=timezone.utc)
+    raw = row["cooldown_until"]
+    try:
+        cooldown_until = datetime.fromisoformat(raw)
+    except Exception:
+        # If corrupted, clear
+        return None, raw
 
-        now = _utcnow()
-        if cooldown_until <= now:
-            connection.execute("DELETE FROM surveycto_cooldowns WHERE source = ?", (source,))
-            connection.commit()
-            return None
+    if cooldown_until.tzinfo is None:
+        cooldown_until = cooldown_until.replace(tzinfo=timezone.utc)
 
-        return cooldown_until
+    if cooldown_until <= _utcnow():
+        return None, raw
 
+    return cooldown_until, None
 
-def clear_surveycto_cooldown(source: str) -> None:
+
+def _drop_stale_cooldown(source: str, raw: str) -> None:
+    # Matches the value that was read, so a cooldown set in between survives.
+    with write_connection() as connection:
+        connection.execute(
+            "DELETE FROM surveycto_cooldowns WHERE source = ? AND cooldown_until = ?",
+            (source, raw),
+        )
+
+
+def get_surveycto_cooldown(source: str) -> datetime | None:
+    """Return cooldown_until if the cooldown is still active, else None."""
     with get_connection() as connection:
+        cooldown_until, stale = _cooldown_from(connection, source)
+    if stale is not None:
+        _drop_stale_cooldown(source, stale)
+    return cooldown_until
+
+
+def clear_surveycto_cooldown(source: str) -> None:
+    with write_connection() as connection:
         connection.execute("DELETE FROM surveycto_cooldowns WHERE source = ?", (source,))
         connection.commit()
 
 
 def delete_sync_job(job_id: int) -> bool:
     """Delete a job and its progress. Returns True if something was deleted."""
-    with get_connection() as connection:
+    with write_connection() as connection:
         cur1 = connection.execute("DELETE FROM sync_progress WHERE job_id = ?", (job_id,))
         cur2 = connection.execute("DELETE FROM sync_jobs WHERE id = ?", (job_id,))
         connection.commit()
+    _forget_job_versions((job_id,))
     return (cur1.rowcount or 0) > 0 or (cur2.rowcount or 0) > 0
 
 
 def clear_completed_jobs() -> int:
     """Remove completed/failed jobs from storage. Returns number of jobs deleted."""
-    with get_connection() as connection:
+    with write_connection() as connection:
         ids = [
             int(r["id"])
             for r in connection.execute(
@@ -410,5 +716,6 @@ def clear_completed_jobs() -> int:
         connection.executemany("DELETE FROM sync_progress WHERE job_id = ?", [(i,) for i in ids])
         connection.executemany("DELETE FROM sync_jobs WHERE id = ?", [(i,) for i in ids])
         connection.commit()
+    _forget_job_versions(ids)
     return len(ids)
 
@@ -2,16 +2,18 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime, timezone, timedelta
-from typing import Any
+from typing import Any, Callable, Iterator
 
+import operator
 import random
+import re
 import time
 
 import psycopg2
 import psycopg2.extras as extras
 from psycopg2 import sql
 
-from app.services import postgres_session, surveycto_service, sync_engine
+from app.services import postgres_service, postgres_session, surveycto_service, sync_engine
 
 
 @dataclass
@@ -27,6 +29,15 @@ class SyncRunResult:
     completed_at: datetime
 
 
+# Frontend uses syncMode: "insert" | "upsert"; the runner calls inserts "append".
+_SYNC_MODE_ALIAS = {"insert": "append"}
+_MODES_REQUIRING_PK = frozenset({"upsert"})
+
+
+def _normalize_sync_mode(mode: str) -> str:
+    return _SYNC_MODE_ALIAS.get(mode, mode)
+
+
 def _is_transient_pg_error(exc: Exception) -> bool:
     msg = str(exc).lower()
     return (
@@ -42,119 +53,108 @@ def _is_transient_pg_error(exc: Exception) -> bool:
     )
 
 
-def run_sync_job(job_id: int) -> SyncRunResult:
-    started_at = datetime.now(tz=timezone.utc)
-    errors: list[dict[str, Any]] = []
-
-    # Immediately mark running so the UI does not "spin" with 0/0.
-    sync_engine.mark_progress(
+def _finish(
+    job_id: int,
+    started_at: datetime,
+    status: str,
+    *,
+    errors: list[dict[str, Any]],
+    last_error: str | None = None,
+    processed: int = 0,
+    total: int = 0,
+    inserted: int = 0,
+    updated: int = 0,
+) -> SyncRunResult:
+    """Persist the job's terminal state (one finalize_job write) and return it.
+
+    Every exit of run_sync_job goes through here, so a run cannot end
+    without exactly one terminal transition.
+    """
+    completed_at = datetime.now(tz=timezone.utc)
+    sync_engine.finalize_job(
         job_id,
-        status="running",
-        processed_records=0,
-        total_records=0,
-        inserted_records=0,
-        updated_records=0,
-        errors=[],
+        status=status,
+        last_error=last_error,
+        processed_records=processed,
+        total_records=total,
+        inserted_records=inserted,
+        updated_records=updated,
+        errors=errors,
+        completed_at=completed_at,
+    )
+    return SyncRunResult(
+        job_id=job_id,
+        status=status,
+        processed_records=processed,
+        total_records=total,
+        inserted_records=inserted,
+        updated_records=updated,
+        errors=errors,
         started_at=started_at,
-        completed_at=None,
+        completed_at=completed_at,
     )
 
-    jobs = {j.id: j for j in sync_engine.list_sync_jobs()}
-    job = jobs.get(job_id)
-    if not job:
-        err = [{"recordId": "job", "field": None, "message": f"Job {job_id} not found"}]
+
+def run_sync_job(job_id: int, *, started_at: datetime | None = None) -> SyncRunResult:
+    """Run a sync job to completion and persist its terminal state.
+
+    Pass ``started_at`` when the job was created already running
+    (create_sync_job(..., started_at=...)); its progress row is then left
+    as is instead of being reset to running again.
+    """
+    errors: list[dict[str, Any]] = []
+
+    if started_at is None:
+        started_at = datetime.now(tz=timezone.utc)
+        # Immediately mark running so the UI does not "spin" with 0/0.
         sync_engine.mark_progress(
             job_id,
-            status="failed",
-            errors=err,
-            completed_at=datetime.now(tz=timezone.utc),
-        )
-        return SyncRunResult(
-            job_id=job_id,
-            status="failed",
+            status="running",
             processed_records=0,
             total_records=0,
             inserted_records=0,
             updated_records=0,
-            errors=err,
+            errors=[],
             started_at=started_at,
-            completed_at=datetime.now(tz=timezone.utc),
+            completed_at=None,
         )
 
+    job = sync_engine.get_sync_job(job_id)
+    if not job:
+        err = [{"recordId": "job", "field": None, "message": f"Job {job_id} not found"}]
+        return _finish(job_id, started_at, "failed", errors=err)
+
     cfg = job.config or {}
     form_id = cfg.get("formId")
     session_token = cfg.get("sessionToken")
     schema = cfg.get("targetSchema")
     table = cfg.get("targetTable")
-    sync_mode = cfg.get("syncMode", "upsert")
-
-    # Frontend uses syncMode: "insert" | "upsert"
-    if sync_mode == "insert":
-        sync_mode = "append"
+    sync_mode = _normalize_sync_mode(cfg.get("syncMode", "upsert"))
 
     pk = cfg.get("primaryKeyField") or "KEY"
 
     if not (form_id and session_token and schema and table):
         msg = "Missing job config: formId/sessionToken/targetSchema/targetTable"
-        sync_engine.record_sync_completion(job_id, "failed", msg)
         err = [{"recordId": "config", "field": None, "message": msg}]
-        sync_engine.mark_progress(
-            job_id,
-            status="failed",
-            errors=err,
-            completed_at=datetime.now(tz=timezone.utc),
-        )
-        return SyncRunResult(
-            job_id=job_id,
-            status="failed",
-            processed_records=0,
-            total_records=0,
-            inserted_records=0,
-            updated_records=0,
-            errors=err,
-            started_at=started_at,
-            completed_at=datetime.now(tz=timezone.utc),
-        )
+        return _finish(job_id, started_at, "failed", errors=err, last_error=msg)
 
     source = f"surveycto:{form_id}"
     target = f"postgres:{schema}.{table}"
 
     # If SurveyCTO asked us to wait previously, enforce a local cooldown.
-    cooldown_until = sync_engine.get_surveycto_cooldown(source)
+    cooldown_until, last_sync = sync_engine.get_sync_state(source, target)
     if cooldown_until is not None:
         remaining = int((cooldown_until - datetime.now(tz=timezone.utc)).total_seconds())
         remaining = max(1, remaining)
         msg = f"SurveyCTO cooldown active. Retry after {remaining} seconds."
         errors = [{"recordId": "surveycto", "field": None, "message": msg, "retryAfterSeconds": remaining}]
-        sync_engine.record_sync_completion(job_id, "failed", msg)
-        sync_engine.mark_progress(
-            job_id,
-            status="failed",
-            processed_records=0,
-            total_records=0,
-            inserted_records=0,
-            updated_records=0,
-            errors=errors,
-            completed_at=datetime.now(tz=timezone.utc),
-        )
-        return SyncRunResult(
-            job_id=job_id,
-            status="failed",
-            processed_records=0,
-            total_records=0,
-            inserted_records=0,
-            updated_records=0,
-            errors=errors,
-            started_at=started_at,
-            completed_at=datetime.now(tz=timezone.utc),
-        )
+        return _finish(job_id, started_at, "failed", errors=errors, last_error=msg)
 
-    last_sync = sync_engine.get_last_sync(source, target)
     since_dt = last_sync.last_synced_at if last_sync else None
 
     # 1) Fetch SurveyCTO FIRST
     try:
-        rows = _run_async_fetch(session_token=session_token, form_id=form_id, since_dt=since_dt)
+        rows = surveycto_service.fetch_submissions_wide_json(session_token, form_id, since_dt)
     except surveycto_service.SubmissionsRateLimitError as exc:
         # Persist cooldown so repeated "Try Again" doesn't hammer the API.
         wait_s = getattr(exc, "retry_after_seconds", None)
@@ -162,74 +162,19 @@ def run_sync_job(job_id: int) -> SyncRunResult:
             sync_engine.set_surveycto_cooldown(source, datetime.now(tz=timezone.utc) + timedelta(seconds=wait_s))
         msg = str(exc)
         errors = [{"recordId": "surveycto", "field": None, "message": msg, "retryAfterSeconds": wait_s}]
-        sync_engine.record_sync_completion(job_id, "failed", msg)
-        sync_engine.mark_progress(
-            job_id,
-            status="failed",
-            processed_records=0,
-            total_records=0,
-            inserted_records=0,
-            updated_records=0,
-            errors=errors,
-            completed_at=datetime.now(tz=timezone.utc),
-        )
-        return SyncRunResult(
-            job_id=job_id,
-            status="failed",
-            processed_records=0,
-            total_records=0,
-            inserted_records=0,
-            updated_records=0,
-            errors=errors,
-            started_at=started_at,
-            completed_at=datetime.now(tz=timezone.utc),
-        )
+        return _finish(job_id, started_at, "failed", errors=errors, last_error=msg)
     except surveycto_service.SubmissionsFetchError as exc:
         errors.append({"recordId": "surveycto", "field": None, "message": str(exc)})
-        sync_engine.record_sync_completion(job_id, "failed", str(exc))
-        sync_engine.mark_progress(
-            job_id,
-            status="failed",
-            processed_records=0,
-            total_records=0,
-            inserted_records=0,
-            updated_records=0,
-            errors=errors,
-            completed_at=datetime.now(tz=timezone.utc),
-        )
-        return SyncRunResult(
-            job_id=job_id,
-            status="failed",
-            processed_records=0,
-            total_records=0,
-            inserted_records=0,
-            updated_records=0,
-            errors=errors,
-            started_at=started_at,
-            completed_at=datetime.now(tz=timezone.utc),
-        )
+        return _finish(job_id, started_at, "failed", errors=errors, last_error=str(exc))
     except Exception as exc:
         errors.append({"recordId": "sync", "field": None, "message": f"Unexpected error: {exc!r}"})
-        sync_engine.record_sync_completion(job_id, "failed", str(exc))
-        sync_engine.mark_progress(
-            job_id,
-            status="failed",
-            errors=errors,
-            completed_at=datetime.now(tz=timezone.utc),
-        )
-        return SyncRunResult(
-            job_id=job_id,
-            status="failed",
-            processed_records=0,
-            total_records=0,
-            inserted_records=0,
-            updated_records=0,
-            errors=errors,
-            started_at=started_at,
-            completed_at=datetime.now(tz=timezone.utc),
-        )
+        return _finish(job_id, started_at, "failed", errors=errors, last_error=str(exc))
 
     total = len(rows)
+    if total == 0:
+        sync_engine.upsert_last_sync(source, target, datetime.now(tz=timezone.utc))
+        return _finish(job_id, started_at, "completed", errors=[])
+
     sync_engine.mark_progress(
         job_id,
         status="running",
@@ -239,107 +184,32 @@ def run_sync_job(job_id: int) -> SyncRunResult:
         updated_records=0,
         errors=[],
     )
-    if total == 0:
-        sync_engine.record_sync_completion(job_id, "completed", None)
-        sync_engine.upsert_last_sync(source, target, datetime.now(tz=timezone.utc))
-        completed_at = datetime.now(tz=timezone.utc)
-        sync_engine.mark_progress(
-            job_id,
-            status="completed",
-            processed_records=0,
-            total_records=0,
-            inserted_records=0,
-            updated_records=0,
-            errors=[],
-            completed_at=completed_at,
-        )
-        return SyncRunResult(
-            job_id=job_id,
-            status="completed",
-            processed_records=0,
-            total_records=0,
-            inserted_records=0,
-            updated_records=0,
-            errors=[],
-            started_at=started_at,
-            completed_at=completed_at,
-        )
 
     col_names = sorted({k for r in rows for k in r.keys() if k and isinstance(k, str)})
 
     # For upsert, PK must exist in incoming data
-    if sync_mode == "upsert" and pk not in col_names:
+    if sync_mode in _MODES_REQUIRING_PK and pk not in col_names:
         msg = f"primary key field '{pk}' not present in data columns"
         errors.append({"recordId": "config", "field": None, "message": msg})
-        sync_engine.record_sync_completion(job_id, "failed", msg)
-        sync_engine.mark_progress(
-            job_id,
-            status="failed",
-            processed_records=0,
-            total_records=total,
-            errors=errors,
-            completed_at=datetime.now(tz=timezone.utc),
-        )
-        return SyncRunResult(
-            job_id=job_id,
-            status="failed",
-            processed_records=0,
-            total_records=total,
-            inserted_records=0,
-            updated_records=0,
-            errors=errors,
-            started_at=started_at,
-            completed_at=datetime.now(tz=timezone.utc),
-        )
+        return _finish(job_id, started_at, "failed", errors=errors, last_error=msg, total=total)
 
     creds = postgres_session.get_credentials()
     if not creds:
         msg = "Postgres not connected (missing stored credentials)."
         errors.append({"recordId": "postgres", "field": None, "message": msg})
-        sync_engine.record_sync_completion(job_id, "failed", msg)
-        sync_engine.mark_progress(
-            job_id,
-            status="failed",
-            processed_records=0,
-            total_records=total,
-            errors=errors,
-            completed_at=datetime.now(tz=timezone.utc),
-        )
-        return SyncRunResult(
-            job_id=job_id,
-            status="failed",
-            processed_records=0,
-            total_records=total,
-            inserted_records=0,
-            updated_records=0,
-            errors=errors,
-            started_at=started_at,
-            completed_at=datetime.now(tz=timezone.utc),
-        )
+        return _finish(job_id, started_at, "failed", errors=errors, last_error=msg, total=total)
 
     def _connect_pg():
         """
-        Robust connect with retries to survive transient provider/network/pooler drops.
+        Open the run's own connection (with the credentials captured at its
+        start), retrying transient provider/network/pooler drops.
         """
-        sslmode = getattr(creds, "sslmode", None) or "require"
         last_exc: Exception | None = None
 
         for attempt in range(1, 5):  # 4 attempts
             try:
-                return psycopg2.connect(
-                    host=creds.host,
-                    port=creds.port,
-                    dbname=creds.database,
-                    user=creds.username,
-                    password=creds.password,
-                    sslmode=sslmode,
-                    connect_timeout=10,
-                    keepalives=1,
-                    keepalives_idle=30,
-                    keepalives_interval=10,
-                    keepalives_count=5,
-                    application_name="surveysync-connect",
-                )
+                # Not autocommit: the job's writes run as one transaction (see _write_once).
+                return postgres_service.open_connection(creds)
             except (psycopg2.OperationalError, psycopg2.InterfaceError) as exc:
                 last_exc = exc
                 if (not _is_transient_pg_error(exc)) or attempt == 4:
@@ -351,29 +221,50 @@ def run_sync_job(job_id: int) -> SyncRunResult:
 
     def _write_once() -> tuple[int, int]:
         """
-        Write with a fresh connection; retry once on transient TLS/socket drops.
+        Write in one transaction; retry once on transient TLS/socket drops.
         """
         for attempt in range(1, 3):  # 2 attempts
             conn = _connect_pg()
             try:
-                with conn:
-                    with conn.cursor() as cur:
-                        _ensure_table_ready(cur, schema, table, col_names, sync_mode, pk)
-
-                        if sync_mode == "append":
-                            ins = _insert_append(cur, schema, table, col_names, rows)
-                            return ins, 0
-                        else:
-                            return _upsert(cur, schema, table, col_names, rows, pk)
+                # Counters restart with each attempt, as the previous one rolled back.
+                with sync_engine.ProgressBuffer(job_id) as progress:
+                    with conn:
+                        with conn.cursor() as cur:
+                            is_view = _ensure_table_ready(cur, schema, table, col_names, sync_mode, pk)
+
+                            if sync_mode == "append":
+                                # COPY can't target a view; INSERT works for auto-updatable ones.
+                                write = _insert_values if is_view else _insert_append
+                                # Batches are counted as they are sent, before the
+                                # server has applied them: report them as processed
+                                # only, one batch behind, like _upsert() does.
+                                held = 0
+
+                                def sent(n: int) -> None:
+                                    nonlocal held
+                                    if held:
+                                        progress.add(processed=held)
+                                    held = n
+
+                                ins = write(cur, schema, table, col_names, rows, on_batch=sent)
+                                upd = 0
+                            else:
+                                ins, upd = _upsert(
+                                    cur, schema, table, col_names, rows, pk,
+                                    on_batch=lambda n: progress.add(processed=n),
+                                )
+                    # Committed: report the rows held back (and, for append, the inserts).
+                    progress.add(
+                        processed=ins + upd - progress.processed,
+                        inserted=ins if sync_mode == "append" else 0,
+                    )
+                    return ins, upd
             except (psycopg2.OperationalError, psycopg2.InterfaceError) as exc:
                 if (not _is_transient_pg_error(exc)) or attempt == 2:
                     raise
                 time.sleep(1.0)
             finally:
-                try:
-                    conn.close()
-                except Exception:
-                    pass
+                conn.close()
 
         raise RuntimeError("Unreachable")
 
@@ -385,61 +276,48 @@ def run_sync_job(job_id: int) -> SyncRunResult:
         inserted, updated = _write_once()
     except Exception as exc:
         errors.append({"recordId": "postgres", "field": None, "message": f"Postgres write failed: {exc}"})
-        sync_engine.record_sync_completion(job_id, "failed", str(exc))
-        sync_engine.mark_progress(
+        return _finish(
             job_id,
-            status="failed",
-            processed_records=0,
-            total_records=total,
-            inserted_records=inserted,
-            updated_records=updated,
-            errors=errors,
-            completed_at=datetime.now(tz=timezone.utc),
-        )
-        return SyncRunResult(
-            job_id=job_id,
-            status="failed",
-            processed_records=0,
-            total_records=total,
-            inserted_records=inserted,
-            updated_records=updated,
+            started_at,
+            "failed",
             errors=errors,
-            started_at=started_at,
-            completed_at=datetime.now(tz=timezone.utc),
+            last_error=str(exc),
+            total=total,
+            inserted=inserted,
+            updated=updated,
         )
 
+    # The write may have created the target table or added columns.
+    postgres_session.invalidate_schema_cache()
+
     # Clear any cooldown once we successfully pulled and wrote.
     sync_engine.clear_surveycto_cooldown(source)
 
     # Advance last_sync based on data timestamps (CompletionDate preferred).
     next_sync_at = _compute_next_sync_time(rows) or datetime.now(tz=timezone.utc)
     sync_engine.upsert_last_sync(source, target, next_sync_at)
-    sync_engine.record_sync_completion(job_id, "completed", None)
 
-    completed_at = datetime.now(tz=timezone.utc)
-    sync_engine.mark_progress(
+    return _finish(
         job_id,
-        status="completed",
-        processed_records=total,
-        total_records=total,
-        inserted_records=inserted,
-        updated_records=updated,
-        errors=[],
-        completed_at=completed_at,
-    )
-    return SyncRunResult(
-        job_id=job_id,
-        status="completed",
-        processed_records=total,
-        total_records=total,
-        inserted_records=inserted,
-        updated_records=updated,
+        started_at,
+        "completed",
         errors=[],
-        started_at=started_at,
-        completed_at=completed_at,
+        processed=total,
+        total=total,
+        inserted=inserted,
+        updated=updated,
     )
 
 
+_MONTHS = {m: i for i, m in enumerate(("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"), 1)}
+# "Sep 25, 2025 1:11:52 PM" / "Sep 25, 2025 1:11 PM" (same formats as the
+# strptime fallbacks below, which are ~10x slower per row).
+_SURVEYCTO_DATETIME_RE = re.compile(
+    r"([a-z]{3}) (\d{1,2}), (\d{4}) (\d{1,2}):(\d{2})(?::(\d{2}))? ([ap]m)",
+    re.IGNORECASE,
+)
+
+
 def _parse_surveycto_datetime(value: Any) -> datetime | None:
     """Best-effort parse of common SurveyCTO datetime formats.
 
@@ -459,6 +337,22 @@ def _parse_surveycto_datetime(value: Any) -> datetime | None:
     if not s:
         return None
 
+    # Common SurveyCTO format, parsed without strptime: this runs per row.
+    m = _SURVEYCTO_DATETIME_RE.fullmatch(s)
+    if m is not None:
+        month = _MONTHS.get(m.group(1).lower())
+        hour = int(m.group(4))
+        if month is not None and 1 <= hour <= 12:
+            hour = hour % 12 + (12 if m.group(7).lower() == "pm" else 0)
+            try:
+                return datetime(
+                    int(m.group(3)), month, int(m.group(2)),
+                    hour, int(m.group(5)), int(m.group(6) or 0),
+                    tzinfo=timezone.utc,
+                )
+            except ValueError:
+                pass
+
     # ISO 8601
     try:
         dt = datetime.fromisoformat(s.replace("Z", "+00:00"))
@@ -500,89 +394,258 @@ def _compute_next_sync_time(rows: list[dict]) -> datetime | None:
     return None
 
 
-def _run_async_fetch(session_token: str, form_id: str, since_dt: datetime | None) -> list[dict]:
-    import asyncio
+# Rows streamed into a COPY between progress reports.
+_WRITE_BATCH_ROWS = 5000
+
+
+def _copy_text_value(v: Any) -> str:
+    """Render a value as a COPY text-format field, matching how psycopg2
+    would have adapted it for a TEXT column."""
+    if type(v) is str:
+        # SurveyCTO's wide JSON is almost all strings.
+        text = v
+    elif v is None:
+        return "\\N"
+    elif v is True:
+        return "true"
+    elif v is False:
+        return "false"
+    else:
+        text = str(_coerce_value(v))
+    if "\\" in text or "\t" in text or "\n" in text or "\r" in text:
+        text = text.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+    return text
+
+
+def _row_getter(cols: list[str]) -> Callable[[dict], tuple]:
+    """Return a function extracting ``cols`` from a row as a tuple.
+
+    operator.itemgetter does the lookups in C. A row missing one of the
+    columns (possible, since cols is the union over all rows) falls back to
+    per-key .get() so the missing values come out as None.
+    """
+    get = operator.itemgetter(*cols)
+    if len(cols) == 1:
+        single = get
+
+        def get(r: dict) -> tuple:
+            return (single(r),)
+
+    def extract(r: dict) -> tuple:
+        try:
+            return get(r)
+        except KeyError:
+            return tuple(r.get(c) for c in cols)
+
+    return extract
+
 
-    return asyncio.run(surveycto_service.fetch_submissions_wide_json(session_token, form_id, since_dt))
+class _CopySource:
+    """Read-only file object that renders COPY text lazily from an iterator of lines.
 
+    copy_expert() pulls fixed-size chunks, so rows are formatted as the server
+    consumes them: a single COPY for the whole job, without buffering it.
+    """
 
-def _insert_append(cur, schema: str, table: str, cols: list[str], rows: list[dict]) -> int:
-    q = sql.SQL("INSERT INTO {}.{} ({}) VALUES ({})").format(
+    def __init__(self, lines: Iterator[str]) -> None:
+        self._lines = lines
+        self._pending = ""
+
+    def read(self, size: int = -1) -> str:
+        chunks = [self._pending]
+        n = len(self._pending)
+        while size < 0 or n < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            chunks.append(line)
+            n += len(line)
+        data = "".join(chunks)
+        if size < 0 or n <= size:
+            self._pending = ""
+            return data
+        self._pending = data[size:]
+        return data[:size]
+
+
+# Characters handed to COPY per read() call.
+_COPY_CHUNK_CHARS = 1 << 16
+
+
+def _insert_append(
+    cur,
+    schema: str,
+    table: str,
+    cols: list[str],
+    rows: list[dict],
+    on_batch: Callable[[int], None] | None = None,
+) -> int:
+    # COPY avoids per-row statement parsing entirely; the text is streamed
+    # from the rows so nothing beyond one chunk is held in memory.
+    q = sql.SQL("COPY {}.{} ({}) FROM STDIN").format(
         sql.Identifier(schema),
         sql.Identifier(table),
         sql.SQL(",").join(sql.Identifier(c) for c in cols),
-        sql.SQL(",").join(sql.Placeholder() for _ in cols),
     )
-    values = [tuple(_coerce_value(r.get(c)) for c in cols) for r in rows]
-    extras.execute_batch(cur, q, values, page_size=500)
-    return len(values)
-
-
-def _upsert(cur, schema: str, table: str, cols: list[str], rows: list[dict], pk: str) -> tuple[int, int]:
+    extract = _row_getter(cols)
+
+    def lines() -> Iterator[str]:
+        for i, r in enumerate(rows, 1):
+            yield "\t".join(map(_copy_text_value, extract(r))) + "\n"
+            if on_batch is not None and i % _WRITE_BATCH_ROWS == 0:
+                on_batch(_WRITE_BATCH_ROWS)
+        if on_batch is not None and len(rows) % _WRITE_BATCH_ROWS:
+            on_batch(len(rows) % _WRITE_BATCH_ROWS)
+
+    cur.copy_expert(q.as_string(cur), _CopySource(lines()), size=_COPY_CHUNK_CHARS)
+    return len(rows)
+
+
+# Per-transaction staging table for _upsert(); dropped at commit/rollback.
+_UPSERT_STAGE_TABLE = "surveysync_upsert_stage"
+
+
+def _insert_values(
+    cur,
+    schema: str,
+    table: str,
+    cols: list[str],
+    rows: list[dict],
+    on_batch: Callable[[int], None] | None = None,
+) -> int:
+    # Append path for view targets, which COPY rejects ("cannot copy to view").
+    q = sql.SQL("INSERT INTO {}.{} ({}) VALUES %s").format(
+        sql.Identifier(schema),
+        sql.Identifier(table),
+        sql.SQL(",").join(sql.Identifier(c) for c in cols),
+    ).as_string(cur)
+    extract = _row_getter(cols)
+    for start in range(0, len(rows), _WRITE_BATCH_ROWS):
+        page = rows[start:start + _WRITE_BATCH_ROWS]
+        extras.execute_values(
+            cur, q, [tuple(map(_coerce_value, extract(r))) for r in page], page_size=_WRITE_BATCH_ROWS
+        )
+        if on_batch is not None:
+            on_batch(len(page))
+    return len(rows)
+
+
+def _upsert(
+    cur,
+    schema: str,
+    table: str,
+    cols: list[str],
+    rows: list[dict],
+    pk: str,
+    on_batch: Callable[[int], None] | None = None,
+) -> tuple[int, int]:
     if pk not in cols:
         raise ValueError(f"primary key field '{pk}' not present in data columns")
 
     insert_cols = cols
-    placeholders = sql.SQL(",").join(sql.Placeholder() for _ in insert_cols)
 
     update_cols = [c for c in insert_cols if c != pk]
     set_clause = sql.SQL(",").join(
         sql.SQL("{} = EXCLUDED.{}").format(sql.Identifier(c), sql.Identifier(c)) for c in update_cols
     )
 
-    q = sql.SQL(
-        "INSERT INTO {}.{} ({}) VALUES ({}) "
-        "ON CONFLICT ({}) DO UPDATE SET {}"
-    ).format(
-        sql.Identifier(schema),
-        sql.Identifier(table),
-        sql.SQL(",").join(sql.Identifier(c) for c in insert_cols),
-        placeholders,
-        sql.Identifier(pk),
-        set_clause,
-    )
-
-    values = [tuple(_coerce_value(r.get(c)) for c in insert_cols) for r in rows]
-    extras.execute_batch(cur, q, values, page_size=500)
-
-    # Without RETURNING we can't split inserted vs updated accurately
-    return (0, len(values))
+    unique_rows = _coalesce_by_pk(rows, pk)
+    if not unique_rows:
+        return 0, 0
 
+    # Stage the rows with the same streamed COPY as append mode, into a temp
+    # table typed like the target's columns, then upsert them all with one
+    # statement: Postgres parses and plans it once per job rather than once
+    # per multi-row VALUES page, and no row is rendered as SQL text.
+    stage = sql.Identifier(_UPSERT_STAGE_TABLE)
+    col_list = sql.SQL(",").join(sql.Identifier(c) for c in insert_cols)
+    cur.execute(
+        sql.SQL("CREATE TEMP TABLE {} ON COMMIT DROP AS SELECT {} FROM {}.{} WITH NO DATA").format(
+            stage, col_list, sql.Identifier(schema), sql.Identifier(table)
+        )
+    )
+    # The last staged batch is not reported: the upsert statement below is
+    # the slow step, so the caller reports the rest once it has committed.
+    held = 0
 
-def _ensure_schema(cur, schema: str) -> None:
-    cur.execute(sql.SQL("CREATE SCHEMA IF NOT EXISTS {}").format(sql.Identifier(schema)))
+    def staged(n: int) -> None:
+        nonlocal held
+        if held and on_batch is not None:
+            on_batch(held)
+        held = n
 
+    _insert_append(cur, "pg_temp", _UPSERT_STAGE_TABLE, insert_cols, unique_rows, on_batch=staged)
 
-def _table_exists(cur, schema: str, table: str) -> bool:
+    # xmax is 0 only on a freshly inserted tuple, which splits the
+    # affected rows into inserted vs updated; Postgres does the counting.
     cur.execute(
-        """
-        SELECT EXISTS (
-            SELECT 1
-            FROM information_schema.tables
-            WHERE table_schema = %s AND table_name = %s
+        sql.SQL(
+            "WITH upserted AS ("
+            "INSERT INTO {}.{} ({}) SELECT {} FROM pg_temp.{} "
+            "ON CONFLICT ({}) DO UPDATE SET {} "
+            "RETURNING (xmax = 0) AS was_inserted"
+            ") SELECT count(*) FILTER (WHERE was_inserted) FROM upserted"
+        ).format(
+            sql.Identifier(schema),
+            sql.Identifier(table),
+            col_list,
+            col_list,
+            stage,
+            sql.Identifier(pk),
+            set_clause,
         )
-        """,
-        (schema, table),
     )
-    return bool(cur.fetchone()[0])
+    inserted = cur.fetchone()[0]
+    return inserted, len(unique_rows) - inserted
+
 
+def _coalesce_by_pk(rows: list[dict], pk: str) -> list[dict]:
+    """Keep only the last row per primary key, in first-seen key order.
 
-def _get_existing_columns(cur, schema: str, table: str) -> set[str]:
+    A key may appear only once per statement with ON CONFLICT DO UPDATE, and
+    the last row is what row-by-row upserts would have left behind; the
+    earlier versions (edits/resubmissions in the same window) never need
+    to reach Postgres.
+    """
+    latest: dict[Any, dict] = {}
+    for r in rows:
+        latest[r.get(pk)] = r
+    return list(latest.values())
+
+
+def _get_existing_columns(cur, schema: str, table: str) -> tuple[str, set[str]] | None:
+    """(relkind, column names) of ``schema.table``, or None if it does not exist.
+
+    One catalog query answers both questions; the LEFT JOIN keeps a
+    zero-column table as a single row with a NULL column name.
+    """
     cur.execute(
         """
-        SELECT column_name
-        FROM information_schema.columns
-        WHERE table_schema = %s AND table_name = %s
+        SELECT c.relkind, a.attname
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        LEFT JOIN pg_attribute a
+          ON a.attrelid = c.oid
+         AND a.attnum > 0
+         AND NOT a.attisdropped
+        WHERE n.nspname = %s
+          AND c.relname = %s
+          AND c.relkind IN ('r', 'p', 'v', 'f')
         """,
         (schema, table),
     )
-    return {r[0] for r in cur.fetchall()}
+    rows = cur.fetchall()
+    if not rows:
+        return None
+    return rows[0][0], {r[1] for r in rows if r[1] is not None}
 
 
 def _create_table(cur, schema: str, table: str, cols: list[str], pk: str | None) -> None:
+    # CREATE SCHEMA rides along in the same round-trip.
     if not cols:
         cur.execute(
-            sql.SQL("CREATE TABLE IF NOT EXISTS {}.{} (dummy TEXT);").format(
+            sql.SQL("CREATE SCHEMA IF NOT EXISTS {}; CREATE TABLE IF NOT EXISTS {}.{} (dummy TEXT);").format(
+                sql.Identifier(schema),
                 sql.Identifier(schema),
                 sql.Identifier(table),
             )
@@ -597,7 +660,8 @@ def _create_table(cur, schema: str, table: str, cols: list[str], pk: str | None)
             col_defs.append(sql.SQL("{} TEXT").format(sql.Identifier(c)))
 
     cur.execute(
-        sql.SQL("CREATE TABLE IF NOT EXISTS {}.{} ({});").format(
+        sql.SQL("CREATE SCHEMA IF NOT EXISTS {}; CREATE TABLE IF NOT EXISTS {}.{} ({});").format(
+            sql.Identifier(schema),
             sql.Identifier(schema),
             sql.Identifier(table),
             sql.SQL(", ").join(col_defs),
@@ -605,30 +669,35 @@ def _create_table(cur, schema: str, table: str, cols: list[str], pk: str | None)
     )
 
 
-def _add_missing_columns(cur, schema: str, table: str, desired_cols: list[str]) -> None:
-    existing = _get_existing_columns(cur, schema, table)
+def _add_missing_columns(cur, schema: str, table: str, existing: set[str], desired_cols: list[str]) -> None:
     missing = [c for c in desired_cols if c not in existing]
-    for c in missing:
-        cur.execute(
-            sql.SQL("ALTER TABLE {}.{} ADD COLUMN {} TEXT").format(
-                sql.Identifier(schema),
-                sql.Identifier(table),
-                sql.Identifier(c),
-            )
+    if not missing:
+        return
+    # One ALTER TABLE for all new columns instead of one per column.
+    cur.execute(
+        sql.SQL("ALTER TABLE {}.{} {}").format(
+            sql.Identifier(schema),
+            sql.Identifier(table),
+            sql.SQL(", ").join(
+                sql.SQL("ADD COLUMN IF NOT EXISTS {} TEXT").format(sql.Identifier(c)) for c in missing
+            ),
         )
+    )
 
 
-def _ensure_table_ready(cur, schema: str, table: str, cols: list[str], sync_mode: str, pk: str) -> None:
-    _ensure_schema(cur, schema)
-
+def _ensure_table_ready(cur, schema: str, table: str, cols: list[str], sync_mode: str, pk: str) -> bool:
+    """Create or extend the target. Returns True if it is a view."""
     desired = list(cols)
     if sync_mode == "upsert" and pk not in desired:
         desired.append(pk)
 
-    if not _table_exists(cur, schema, table):
+    existing = _get_existing_columns(cur, schema, table)
+    if existing is None:
         _create_table(cur, schema, table, desired, pk if sync_mode == "upsert" else None)
-    else:
-        _add_missing_columns(cur, schema, table, desired)
+        return False
+    relkind, columns = existing
+    _add_missing_columns(cur, schema, table, columns, desired)
+    return relkind == "v"
 
 
 def _coerce_value(v: Any) -> Any:
@@ -94,6 +94,7 @@ export interface SyncProgress {
   errors: SyncError[];
   startedAt?: string;
   completedAt?: string;
+  terminal?: boolean;
 }
 
 